@@ -0,0 +1,173 @@
+"""Composite per-user indexes, one DailyLog per user per day, nutrition rollups
+
+Tables have so far been created with create_tables.py (Base.metadata.create_all),
+so this first revision brings such databases up to the current models: every
+step checks what already exists and skips it. What it does create is recorded in
+alembic_created_objects, and downgrade drops exactly that. Fresh databases created
+with create_all after this revision already match it; run `alembic stamp head` there.
+
+Rows that would violate the new unique constraints are never deleted: the upgrade
+aborts and lists them, to be merged or removed by hand before re-running it.
+
+Revision ID: c4e1a7b9d2f0
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7b9d2f0'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, index name, columns)
+INDEXES = [
+    ("nutritionlog", "ix_nutritionlog_user_timestamp", ["user_id", "timestamp"]),
+    ("training_sessions", "ix_training_sessions_user_started_at", ["user_id", "started_at"]),
+    ("chat_messages", "ix_chat_messages_user_timestamp", ["user_id", "timestamp"]),
+    ("injuries", "ix_injuries_user_status", ["user_id", "status"]),
+]
+
+# (table, constraint name, columns). Existing duplicates abort the upgrade.
+UNIQUE_CONSTRAINTS = [
+    ("dailylog", "uq_daily_log_user_date", ["user_id", "date"]),
+    ("daily_tasks", "uq_daily_task_user_due_title", ["user_id", "due_date", "title"]),
+]
+
+
+ROLLUP_TABLE = "nutritiondailyrollup"
+
+# What upgrade created, so downgrade leaves pre-existing (create_all) objects alone
+CREATED_TABLE = "alembic_created_objects"
+created_objects = sa.table(
+    CREATED_TABLE,
+    sa.column("revision", sa.String),
+    sa.column("kind", sa.String),
+    sa.column("table_name", sa.String),
+    sa.column("name", sa.String),
+)
+
+# Duplicate groups listed in the upgrade error before truncating
+MAX_DUPLICATES_SHOWN = 20
+
+
+def _existing(inspector, table):
+    indexes = {ix["name"] for ix in inspector.get_indexes(table)}
+    constraints = {uq["name"] for uq in inspector.get_unique_constraints(table)}
+    return indexes | constraints
+
+
+def _duplicates(bind, table, columns):
+    """(key values, ids) for every group of rows sharing the constraint's columns."""
+    t = sa.table(table, sa.column("id"), *[sa.column(c) for c in columns])
+    keys = [t.c[c] for c in columns]
+    groups = sa.select(*keys).group_by(*keys).having(sa.func.count() > 1).subquery()
+    rows = bind.execute(
+        sa.select(t.c.id, *keys)
+        .join(groups, sa.and_(*[t.c[c] == groups.c[c] for c in columns]))
+        .order_by(*keys, t.c.id)
+    )
+    found = {}
+    for row in rows:
+        found.setdefault(tuple(row[1:]), []).append(row[0])
+    return list(found.items())
+
+
+def _check_duplicates(bind, pending):
+    problems = []
+    for table, name, columns in pending:
+        for key, ids in _duplicates(bind, table, columns):
+            values = ", ".join(f"{c}={v!r}" for c, v in zip(columns, key))
+            problems.append(f"  {table} ({values}): ids {ids}")
+    if problems:
+        shown = problems[:MAX_DUPLICATES_SHOWN]
+        if len(problems) > len(shown):
+            shown.append(f"  ... and {len(problems) - len(shown)} more")
+        raise RuntimeError(
+            "Duplicate rows block the new unique constraints. Merge or delete them, "
+            "then re-run the upgrade:\n" + "\n".join(shown)
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    pending = [
+        (table, name, columns) for table, name, columns in UNIQUE_CONSTRAINTS
+        if table in tables and name not in _existing(inspector, table)
+    ]
+    # Before any DDL, so a failed check leaves the database untouched
+    _check_duplicates(bind, pending)
+
+    op.create_table(
+        CREATED_TABLE,
+        sa.Column("revision", sa.String(32), nullable=False),
+        sa.Column("kind", sa.String(16), nullable=False),
+        sa.Column("table_name", sa.String(64), nullable=False),
+        sa.Column("name", sa.String(64), nullable=False),
+    )
+    created = []
+
+    for table, name, columns in pending:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(name, columns)
+        created.append(("unique", table, name))
+
+    for table, name, columns in INDEXES:
+        if table in tables and name not in _existing(inspector, table):
+            op.create_index(name, table, columns)
+            created.append(("index", table, name))
+
+    if ROLLUP_TABLE not in tables:
+        op.create_table(
+            ROLLUP_TABLE,
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("total_calories", sa.Integer(), nullable=False),
+            sa.Column("total_protein", sa.Float(), nullable=False),
+            sa.Column("total_carbs", sa.Float(), nullable=False),
+            sa.Column("total_fats", sa.Float(), nullable=False),
+            sa.Column("meal_count", sa.Integer(), nullable=False),
+            sa.UniqueConstraint("user_id", "date", name="uq_nutrition_rollup_user_date"),
+        )
+        op.create_index("ix_nutritiondailyrollup_id", ROLLUP_TABLE, ["id"])
+        created.append(("table", ROLLUP_TABLE, ROLLUP_TABLE))
+        print("Created nutritiondailyrollup; run backfill_nutrition_rollups.py to fill it")
+
+    if created:
+        op.bulk_insert(created_objects, [
+            {"revision": revision, "kind": kind, "table_name": table, "name": name}
+            for kind, table, name in created
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    created = bind.execute(
+        sa.select(created_objects.c.kind, created_objects.c.table_name, created_objects.c.name)
+        .where(created_objects.c.revision == revision)
+    ).all()
+
+    # Reverse creation order: indexes before the tables they could live on
+    for kind, table, name in reversed(created):
+        if kind == "table":
+            op.drop_table(table)
+        elif kind == "index":
+            op.drop_index(name, table_name=table)
+        elif kind == "unique":
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_constraint(name, type_="unique")
+
+    op.drop_table(CREATED_TABLE)
@@ -1,4 +1,5 @@
 from typing import Dict, List, Any
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
 from app.models.user import User
@@ -25,28 +26,16 @@ class AIAnalyzer:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        # Get daily logs
-        daily_logs = db.query(DailyLog).filter(
+        # Calculate metrics (aggregated in the database)
+        metrics = self._calculate_metrics(user.id, db, start_date, end_date)
+        
+        # Only the columns trend detection needs, oldest first
+        daily_logs = db.query(DailyLog.sleep_hours, DailyLog.recovery_score).filter(
             DailyLog.user_id == user.id,
             DailyLog.date >= start_date,
             DailyLog.date <= end_date
         ).order_by(DailyLog.date).all()
         
-        # Get nutrition logs
-        nutrition_logs = db.query(NutritionLog).filter(
-            NutritionLog.user_id == user.id,
-            NutritionLog.timestamp >= datetime.combine(start_date, datetime.min.time())
-        ).all()
-        
-        # Get training sessions
-        training_sessions = db.query(TrainingSession).filter(
-            TrainingSession.user_id == user.id,
-            TrainingSession.date >= start_date
-        ).all()
-        
-        # Calculate metrics
-        metrics = self._calculate_metrics(daily_logs, nutrition_logs, training_sessions)
-        
         # Detect patterns and issues
         patterns = self._detect_patterns(metrics, daily_logs)
         
@@ -61,11 +50,41 @@ class AIAnalyzer:
             "generated_at": datetime.utcnow().isoformat()
         }
     
-    def _calculate_metrics(self, daily_logs: List[DailyLog], nutrition_logs: List[NutritionLog], 
-                          training_sessions: List[TrainingSession]) -> Dict[str, Any]:
-        """Calculate aggregate metrics from user data."""
+    def _calculate_metrics(self, user_id: int, db: Session, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Calculate aggregate metrics from user data in a single aggregate query."""
+        
+        start_of_period = datetime.combine(start_date, datetime.min.time())
+        
+        # Nutrition and training counts ride along as scalar subqueries
+        nutrition_days = db.query(
+            func.count(func.distinct(func.date(NutritionLog.timestamp)))
+        ).filter(
+            NutritionLog.user_id == user_id,
+            NutritionLog.timestamp >= start_of_period
+        ).scalar_subquery()
+        
+        workouts = db.query(func.count(TrainingSession.id)).filter(
+            TrainingSession.user_id == user_id,
+            TrainingSession.started_at >= start_of_period
+        ).scalar_subquery()
+        
+        row = db.query(
+            func.count(DailyLog.id).label("days"),
+            func.coalesce(func.sum(DailyLog.total_calories_in), 0).label("total_calories"),
+            func.coalesce(func.sum(DailyLog.total_training_minutes), 0).label("total_training"),
+            func.coalesce(func.sum(case((DailyLog.sleep_hours > 0, DailyLog.sleep_hours), else_=0)), 0).label("total_sleep"),
+            func.count(case((DailyLog.sleep_hours > 0, 1))).label("sleep_count"),
+            func.coalesce(func.sum(case((DailyLog.recovery_score > 0, DailyLog.recovery_score), else_=0)), 0).label("total_recovery"),
+            func.count(case((DailyLog.recovery_score > 0, 1))).label("recovery_count"),
+            nutrition_days.label("nutrition_days"),
+            workouts.label("workouts")
+        ).filter(
+            DailyLog.user_id == user_id,
+            DailyLog.date >= start_date,
+            DailyLog.date <= end_date
+        ).one()
         
-        if not daily_logs:
+        if not row.days:
             return {
                 "avg_calories": 0,
                 "avg_training_minutes": 0,
@@ -75,30 +94,19 @@ class AIAnalyzer:
                 "nutrition_consistency": 0
             }
         
-        # Daily log metrics
-        total_calories = sum(log.total_calories_in for log in daily_logs)
-        total_training = sum(log.total_training_minutes for log in daily_logs)
-        total_sleep = sum(log.sleep_hours for log in daily_logs if log.sleep_hours)
-        total_recovery = sum(log.recovery_score for log in daily_logs if log.recovery_score)
-        
-        sleep_count = len([log for log in daily_logs if log.sleep_hours and log.sleep_hours > 0])
-        recovery_count = len([log for log in daily_logs if log.recovery_score and log.recovery_score > 0])
-        
-        # Nutrition metrics
-        days_with_nutrition = len(set(log.timestamp.date() for log in nutrition_logs))
-        nutrition_consistency = (days_with_nutrition / len(daily_logs) * 100) if daily_logs else 0
+        nutrition_consistency = row.nutrition_days / row.days * 100
         
         return {
-            "avg_calories": round(total_calories / len(daily_logs), 1) if daily_logs else 0,
-            "avg_training_minutes": round(total_training / len(daily_logs), 1) if daily_logs else 0,
-            "avg_sleep_hours": round(total_sleep / sleep_count, 1) if sleep_count > 0 else 0,
-            "avg_recovery_score": round(total_recovery / recovery_count, 1) if recovery_count > 0 else 0,
-            "total_workouts": len(training_sessions),
+            "avg_calories": round(row.total_calories / row.days, 1),
+            "avg_training_minutes": round(row.total_training / row.days, 1),
+            "avg_sleep_hours": round(row.total_sleep / row.sleep_count, 1) if row.sleep_count > 0 else 0,
+            "avg_recovery_score": round(row.total_recovery / row.recovery_count, 1) if row.recovery_count > 0 else 0,
+            "total_workouts": row.workouts,
             "nutrition_consistency": round(nutrition_consistency, 1),
-            "days_analyzed": len(daily_logs)
+            "days_analyzed": row.days
         }
     
-    def _detect_patterns(self, metrics: Dict[str, Any], daily_logs: List[DailyLog]) -> Dict[str, Any]:
+    def _detect_patterns(self, metrics: Dict[str, Any], daily_logs: List[Any]) -> Dict[str, Any]:
         """Detect patterns and potential issues in user data."""
         
         issues = []
@@ -150,7 +158,7 @@ class AIAnalyzer:
             "trends": trends
         }
     
-    def _analyze_trends(self, daily_logs: List[DailyLog]) -> Dict[str, str]:
+    def _analyze_trends(self, daily_logs: List[Any]) -> Dict[str, str]:
         """Analyze trends in daily metrics."""
         
         if len(daily_logs) < 3:
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import re
+from typing import AsyncIterator, Callable, List, Optional
+import google.generativeai as genai
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from .llm_service import LLMService, response_cache
+from .response_cache import ResponseCache
+
+
+def chunk_text(text: str) -> List[str]:
+    """Split text into word-sized chunks, keeping trailing whitespace so chunks rejoin exactly."""
+    return re.findall(r"\s*\S+\s*", text) or [text]
+
+
+class StreamInterrupted(Exception):
+    """Raised when a response stream fails after part of it was already yielded."""
+    pass
+
+
+class GeminiBackend:
+    """Gemini backend sharing one configured model (and its HTTP client) across calls."""
+
+    def __init__(self, api_key: str, model_name: str = "gemini-pro"):
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        chat = self.model.start_chat(history=[
+            {"role": "user", "parts": [system_prompt]}
+        ])
+        response = await chat.send_message_async(user_message)
+        return response.text
+
+    async def stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        chat = self.model.start_chat(history=[
+            {"role": "user", "parts": [system_prompt]}
+        ])
+        response = await chat.send_message_async(user_message, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend:
+    """
+    Local stand-in for Gemini used offline, in tests and in benchmarks.
+    Answers with the simulated coach after an optional artificial latency.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        responder: Optional[Callable[[str], str]] = None,
+        model_name: str = "simulated"
+    ):
+        self.latency_seconds = latency_seconds
+        self.responder = responder or LLMService._simulate_intelligence
+        self.model_name = model_name
+
+    async def complete(self, system_prompt: str, user_message: str) -> str:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return self.responder(user_message)
+
+    async def stream(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        # Spread the latency over the chunks to mimic token streaming
+        chunks = chunk_text(self.responder(user_message))
+        for chunk in chunks:
+            if self.latency_seconds:
+                await asyncio.sleep(self.latency_seconds / len(chunks))
+            yield chunk
+
+
+def create_backend():
+    """
+    Pick the backend from settings; Gemini needs GEMINI_API_KEY, so 'auto' and 'gemini'
+    both fall back to the stub without one.
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if settings.LLM_BACKEND in ("gemini", "auto") and api_key:
+        return GeminiBackend(api_key)
+    if settings.LLM_BACKEND == "gemini":
+        print("LLM_BACKEND=gemini but GEMINI_API_KEY is not set, using the simulated coach")
+    return StubBackend(latency_seconds=settings.LLM_STUB_LATENCY_MS / 1000.0)
+
+
+class AsyncLLMService:
+    """
+    Non-blocking counterpart of LLMService for async endpoints.
+    Limits in-flight requests with a semaphore and bounds each call, including the wait
+    for a semaphore slot, with a timeout. Cache lookups run in the threadpool since the
+    persistent tier does blocking SQLite I/O.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.backend = backend or create_backend()
+        self.cache = cache if cache is not None else response_cache
+        self.timeout_seconds = timeout_seconds or settings.LLM_TIMEOUT_SECONDS
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.LLM_MAX_CONCURRENCY)
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    async def generate_response(self, system_prompt: str, user_message: str) -> str:
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model_name, system_prompt, user_message)
+            cached = await run_in_threadpool(self.cache.get, key)
+            if cached is not None:
+                return cached
+
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                async with self._semaphore:
+                    text = await self.backend.complete(system_prompt, user_message)
+        except TimeoutError:
+            print(f"LLM Timeout after {self.timeout_seconds}s")
+            return LLMService._simulate_intelligence(user_message)
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            return LLMService._simulate_intelligence(user_message)
+
+        if key is not None:
+            await run_in_threadpool(self.cache.set, key, text)
+        return text
+
+    async def stream_response(self, system_prompt: str, user_message: str) -> AsyncIterator[str]:
+        """
+        Yield the response in chunks as the backend produces them.
+        The full text is cached once the stream completes. A failure before the first
+        chunk falls back to the simulated coach; after it, raises StreamInterrupted.
+        """
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model_name, system_prompt, user_message)
+            cached = await run_in_threadpool(self.cache.get, key)
+            if cached is not None:
+                for chunk in chunk_text(cached):
+                    yield chunk
+                return
+
+        parts = []
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                await self._semaphore.acquire()
+            try:
+                stream = self.backend.stream(system_prompt, user_message).__aiter__()
+                while True:
+                    try:
+                        # Timeout applies per chunk so long answers are not cut off
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout_seconds)
+                    except StopAsyncIteration:
+                        break
+                    parts.append(chunk)
+                    yield chunk
+            finally:
+                self._semaphore.release()
+        except Exception as e:
+            print(f"LLM Stream Error: {e}")
+            if parts:
+                # The client already has part of an answer; a fallback would be spliced onto it
+                raise StreamInterrupted(f"Stream failed after {len(parts)} chunks") from e
+            for chunk in chunk_text(LLMService._simulate_intelligence(user_message)):
+                yield chunk
+            return
+
+        if key is not None and parts:
+            await run_in_threadpool(self.cache.set, key, "".join(parts))
@@ -1,7 +1,10 @@
+from typing import AsyncIterator
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from .context_manager import ContextManager
 from .llm_service import LLMService
+from .async_llm_service import AsyncLLMService
 # from .finetuning_service import FineTuningService
 import time
 
@@ -15,6 +18,7 @@ class CoachOrchestrator:
     
     def __init__(self):
         self.llm = LLMService()
+        self.async_llm = AsyncLLMService()
         self.finetuning = None  # Temporarily disabled
         # try:
         #     self.finetuning = FineTuningService()
@@ -27,19 +31,7 @@ class CoachOrchestrator:
         context_str = ContextManager.build_context(user, db)
         
         # 2. System Prompt
-        system_prompt = f"""
-        You are 'Hybrid Coach', an elite AI performance coach for a hybrid athlete application.
-        Your goal is to provide specific, actionable, and empathetic advice based on the user's data.
-        
-        CONTEXT DATA:
-        {context_str}
-        
-        GUIDELINES:
-        - Be concise but professional.
-        - If fatigue is high (>80%), RECOMMEND REST or Active Recovery.
-        - Support goals of Strength, Boxing, and Endurance.
-        - Answer directly. Do not say "As an AI...".
-        """
+        system_prompt = self._build_system_prompt(context_str)
         
         # 3. specific Logic Triggers (Hybrid Logic)
         # If specific keywords are found, we might force certain data into the prompt
@@ -51,22 +43,82 @@ class CoachOrchestrator:
         response_time_ms = (time.time() - start_time) * 1000
         
         # 5. Log conversation for fine-tuning (if available)
+        self._log_conversation(user, message, response, system_prompt, context_str, response_time_ms, db)
+        
+        return response
+
+    async def process_message_async(self, user: User, message: str, db: Session) -> str:
+        """
+        Same flow as process_message, but awaits the LLM instead of blocking a worker.
+        Database work is pushed to the threadpool since the session is synchronous.
+        """
+        context_str = await run_in_threadpool(ContextManager.build_context, user, db)
+        system_prompt = self._build_system_prompt(context_str)
+        
+        start_time = time.time()
+        response = await self.async_llm.generate_response(system_prompt, message)
+        response_time_ms = (time.time() - start_time) * 1000
+        
         if self.finetuning:
-            try:
-                user_context_dict = {
-                    "fatigue_state": context_str,
-                    "user_profile": f"Weight: {user.current_weight_kg}kg, Activity: {user.activity_level}"
-                }
-                self.finetuning.log_conversation(
-                    db=db,
-                    user_id=user.id,
-                    user_message=message,
-                    ai_response=response,
-                    system_prompt=system_prompt,
-                    user_context=user_context_dict,
-                    response_time_ms=response_time_ms
-                )
-            except Exception as e:
-                print(f"Failed to log conversation: {e}")
+            await run_in_threadpool(
+                self._log_conversation, user, message, response, system_prompt, context_str, response_time_ms, db
+            )
         
         return response
+
+    async def stream_message(self, user: User, message: str, db: Session) -> AsyncIterator[str]:
+        """
+        Streaming variant of process_message_async; yields response chunks as they arrive.
+        Only a completed response is logged; StreamInterrupted propagates to the caller.
+        """
+        context_str = await run_in_threadpool(ContextManager.build_context, user, db)
+        system_prompt = self._build_system_prompt(context_str)
+        
+        start_time = time.time()
+        parts = []
+        async for chunk in self.async_llm.stream_response(system_prompt, message):
+            parts.append(chunk)
+            yield chunk
+        response_time_ms = (time.time() - start_time) * 1000
+        
+        if self.finetuning:
+            await run_in_threadpool(
+                self._log_conversation, user, message, "".join(parts), system_prompt, context_str, response_time_ms, db
+            )
+
+    @staticmethod
+    def _build_system_prompt(context_str: str) -> str:
+        return f"""
+        You are 'Hybrid Coach', an elite AI performance coach for a hybrid athlete application.
+        Your goal is to provide specific, actionable, and empathetic advice based on the user's data.
+        
+        CONTEXT DATA:
+        {context_str}
+        
+        GUIDELINES:
+        - Be concise but professional.
+        - If fatigue is high (>80%), RECOMMEND REST or Active Recovery.
+        - Support goals of Strength, Boxing, and Endurance.
+        - Answer directly. Do not say "As an AI...".
+        """
+
+    def _log_conversation(self, user: User, message: str, response: str, system_prompt: str,
+                          context_str: str, response_time_ms: float, db: Session) -> None:
+        if not self.finetuning:
+            return
+        try:
+            user_context_dict = {
+                "fatigue_state": context_str,
+                "user_profile": f"Weight: {user.current_weight_kg}kg, Activity: {user.activity_level}"
+            }
+            self.finetuning.log_conversation(
+                db=db,
+                user_id=user.id,
+                user_message=message,
+                ai_response=response,
+                system_prompt=system_prompt,
+                user_context=user_context_dict,
+                response_time_ms=response_time_ms
+            )
+        except Exception as e:
+            print(f"Failed to log conversation: {e}")
@@ -1,5 +1,9 @@
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import event, literal, select, true
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
 from app.models.user import User
 from app.models.athlete_state import AthleteState
 from app.models.daily_log import DailyLog
@@ -10,7 +14,11 @@ class ContextManager:
     """
     Aggregates all relevant user data into a structured context for the LLM.
     """
-    
+
+    # user_id -> (date, expires_at, context parts from the database)
+    _snapshots: Dict[int, Tuple[date, float, List[str]]] = {}
+    _lock = threading.Lock()
+
     @staticmethod
     def build_context(user: User, db: Session) -> str:
         """
@@ -18,63 +26,141 @@ class ContextManager:
         """
         # Always return at least basic user info
         basic_context = f"User: {user.full_name}, Weight: {user.current_weight_kg}kg, Activity: {user.activity_level}"
-        
+
         # If no database session, return basic context only
         if db is None:
             return basic_context + "\nNote: Full training history unavailable"
-        
+
         try:
-            # Try to get additional context from database
-            context_parts = [basic_context]
-            
-            # Athlete State (Fatigue) - optional
-            try:
-                state = db.query(AthleteState).filter(AthleteState.user_id == user.id).first()
-                if state:
-                    context_parts.append(
-                        f"\nFatigue State:\n"
-                        f"- CNS: {state.cns_fatigue:.1f}%\n"
-                        f"- Upper Body: {state.muscular_fatigue_upper:.1f}%\n"
-                        f"- Lower Body: {state.muscular_fatigue_lower:.1f}%\n"
-                        f"- Cardio: {state.cardio_fatigue:.1f}%"
-                    )
-            except:
-                pass  # Skip if table doesn't exist
-            
-            # Recent Training - optional
-            try:
-                sessions = db.query(TrainingSession).filter(
-                    TrainingSession.user_id == user.id
-                ).order_by(TrainingSession.started_at.desc()).limit(3).all()
-                
-                if sessions:
-                    history_str = "\nRecent Training:\n"
-                    for s in sessions:
-                        history_str += f"- {s.type} on {s.started_at.date()}\n"
-                    context_parts.append(history_str)
-            except:
-                pass  # Skip if table doesn't exist
-            
-            # Daily Logs - optional
-            try:
-                today_log = db.query(DailyLog).filter(
-                    DailyLog.user_id == user.id,
-                    DailyLog.date == date.today()
-                ).first()
-                
-                if today_log:
-                    context_parts.append(
-                        f"\nToday's Status:\n"
-                        f"- Sleep: {today_log.sleep_hours} hrs\n"
-                        f"- Mood: {today_log.mood}/10\n"
-                        f"- Soreness: {today_log.soreness_level}/10"
-                    )
-            except:
-                pass  # Skip if table doesn't exist
-            
-            return "\n".join(context_parts)
-            
+            today = date.today()
+            parts = ContextManager._get_snapshot(user.id, today)
+            if parts is None:
+                parts = ContextManager._load_context_parts(user.id, today, db)
+                ContextManager._store_snapshot(user.id, today, parts)
+
+            return "\n".join([basic_context] + parts)
+
         except Exception as e:
             print(f"Error building context: {e}")
+            db.rollback()
             # Return minimal context if anything fails
             return basic_context + "\nNote: Full training history unavailable"
+
+    @staticmethod
+    def _load_context_parts(user_id: int, today: date, db: Session) -> List[str]:
+        """
+        Fetch fatigue state, the last 3 sessions and today's log in a single round-trip.
+        State and log columns repeat on each of the (up to 3) session rows.
+        """
+        anchor = select(literal(user_id).label("user_id")).subquery("anchor")
+        recent = (
+            select(TrainingSession.type, TrainingSession.started_at)
+            .where(TrainingSession.user_id == user_id)
+            .order_by(TrainingSession.started_at.desc())
+            .limit(3)
+            .cte("recent")
+        )
+        today_log = (
+            select(DailyLog.user_id, DailyLog.sleep_hours, DailyLog.mood, DailyLog.soreness_level)
+            .where(DailyLog.user_id == user_id, DailyLog.date == today)
+            .limit(1)
+            .subquery("today_log")
+        )
+        stmt = (
+            select(
+                AthleteState.id.label("state_id"),
+                AthleteState.cns_fatigue,
+                AthleteState.muscular_fatigue_upper,
+                AthleteState.muscular_fatigue_lower,
+                AthleteState.cardio_fatigue,
+                today_log.c.user_id.label("log_user_id"),
+                today_log.c.sleep_hours,
+                today_log.c.mood,
+                today_log.c.soreness_level,
+                recent.c.type,
+                recent.c.started_at,
+            )
+            .select_from(anchor)
+            .outerjoin(AthleteState, AthleteState.user_id == anchor.c.user_id)
+            .outerjoin(today_log, today_log.c.user_id == anchor.c.user_id)
+            .outerjoin(recent, true())
+            .order_by(recent.c.started_at.desc())
+        )
+        rows = db.execute(stmt).all()
+
+        context_parts = []
+        first = rows[0] if rows else None
+
+        # Athlete State (Fatigue) - optional
+        if first is not None and first.state_id is not None:
+            context_parts.append(
+                f"\nFatigue State:\n"
+                f"- CNS: {first.cns_fatigue:.1f}%\n"
+                f"- Upper Body: {first.muscular_fatigue_upper:.1f}%\n"
+                f"- Lower Body: {first.muscular_fatigue_lower:.1f}%\n"
+                f"- Cardio: {first.cardio_fatigue:.1f}%"
+            )
+
+        # Recent Training - optional
+        sessions = [row for row in rows if row.started_at is not None]
+        if sessions:
+            history_str = "\nRecent Training:\n"
+            for s in sessions:
+                history_str += f"- {s.type} on {s.started_at.date()}\n"
+            context_parts.append(history_str)
+
+        # Daily Logs - optional
+        if first is not None and first.log_user_id is not None:
+            context_parts.append(
+                f"\nToday's Status:\n"
+                f"- Sleep: {first.sleep_hours} hrs\n"
+                f"- Mood: {first.mood}/10\n"
+                f"- Soreness: {first.soreness_level}/10"
+            )
+
+        return context_parts
+
+    @staticmethod
+    def _get_snapshot(user_id: int, today: date) -> Optional[List[str]]:
+        if not settings.CONTEXT_CACHE_ENABLED:
+            return None
+        with ContextManager._lock:
+            snapshot = ContextManager._snapshots.get(user_id)
+            if snapshot and snapshot[0] == today and snapshot[1] > time.time():
+                return snapshot[2]
+            return None
+
+    @staticmethod
+    def _store_snapshot(user_id: int, today: date, parts: List[str]) -> None:
+        if not settings.CONTEXT_CACHE_ENABLED:
+            return
+        with ContextManager._lock:
+            expires_at = time.time() + settings.CONTEXT_CACHE_TTL_SECONDS
+            ContextManager._snapshots[user_id] = (today, expires_at, parts)
+
+    @staticmethod
+    def invalidate(user_id: int) -> None:
+        """Drop the cached context snapshot for a user."""
+        with ContextManager._lock:
+            ContextManager._snapshots.pop(user_id, None)
+
+
+# Snapshot invalidation: remember which users had context rows flushed,
+# then drop their snapshots once the transaction actually commits.
+def _mark_context_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None and target.user_id is not None:
+        session.info.setdefault("context_dirty_users", set()).add(target.user_id)
+
+for _model in (AthleteState, TrainingSession, DailyLog):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_context_dirty)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_contexts(session):
+    for user_id in session.info.pop("context_dirty_users", ()):
+        ContextManager.invalidate(user_id)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_dirty_contexts(session, previous_transaction):
+    session.info.pop("context_dirty_users", None)
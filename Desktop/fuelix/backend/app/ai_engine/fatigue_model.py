@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Dict, Any
+import numpy as np
 
 class FatigueModel:
     """
@@ -14,6 +15,19 @@ class FatigueModel:
         "cardio": 0.6        # Cardio recovers fast (daily)
     }
     
+    # Column order for batch arrays (N athletes x 4 systems)
+    SYSTEMS = ("cns", "muscular_upper", "muscular_lower", "cardio")
+    
+    # AthleteState column holding each system's fatigue
+    STATE_COLUMNS = {
+        "cns": "cns_fatigue",
+        "muscular_upper": "muscular_fatigue_upper",
+        "muscular_lower": "muscular_fatigue_lower",
+        "cardio": "cardio_fatigue"
+    }
+    
+    DEFAULT_IMPACT = {"cns": 10, "muscular_upper": 5, "muscular_lower": 5, "cardio": 5}
+    
     IMPACT_MATRIX = {
         "boxing_heavy": {"cns": 25, "muscular_upper": 15, "cardio": 20},
         "boxing_tech": {"cns": 10, "muscular_upper": 5, "cardio": 10},
@@ -24,23 +38,27 @@ class FatigueModel:
     }
 
     @staticmethod
-    def calculate_decay(state: Dict[str, float], hours_passed: float) -> Dict[str, float]:
-        """Apply exponential decay based on time passed."""
+    def calculate_decay(state: Dict[str, float], hours_passed: float, model: str = "linear") -> Dict[str, float]:
+        """Apply decay based on time passed. model: 'linear' (MVP) or 'exponential'."""
         new_state = state.copy()
         days_passed = hours_passed / 24.0
         
         for system, decay_rate in FatigueModel.DECAY_RATES.items():
-            # Simple linear decay for MVP, capped at 0
-            # Ideally exponential: initial * (1 - rate) ^ days
-            recovery = (decay_rate * 100) * days_passed
-            new_state[f"{system}_fatigue"] = max(0.0, state.get(f"{system}_fatigue", 0.0) - recovery)
+            current = state.get(f"{system}_fatigue", 0.0)
+            if model == "exponential":
+                # initial * (1 - rate) ^ days
+                new_state[f"{system}_fatigue"] = current * (1 - decay_rate) ** days_passed
+            else:
+                # Simple linear decay for MVP, capped at 0
+                recovery = (decay_rate * 100) * days_passed
+                new_state[f"{system}_fatigue"] = max(0.0, current - recovery)
             
         return new_state
 
     @staticmethod
     def apply_impact(state: Dict[str, float], session_type: str, rpe: int, duration_min: int) -> Dict[str, float]:
         """Apply fatigue impact from a completed session."""
-        impact = FatigueModel.IMPACT_MATRIX.get(session_type, {"cns": 10, "muscular_upper": 5, "muscular_lower": 5, "cardio": 5})
+        impact = FatigueModel.IMPACT_MATRIX.get(session_type, FatigueModel.DEFAULT_IMPACT)
         
         # Intensity Multiplier (RPE 1-10)
         intensity_mult = (rpe / 5.0) # RPE 5 is baseline, 10 is double impact
@@ -67,3 +85,31 @@ class FatigueModel:
         ]) / 4.0
         
         return int(max(0, 100 - avg_fatigue))
+
+    # ===== BATCH API (rows = athletes, columns = SYSTEMS) =====
+
+    DECAY_VECTOR = np.array([
+        DECAY_RATES["cns"], DECAY_RATES["muscular_upper"], DECAY_RATES["muscular_lower"], DECAY_RATES["cardio"]
+    ])
+
+    @staticmethod
+    def calculate_decay_batch(fatigue: np.ndarray, hours_passed, model: str = "linear") -> np.ndarray:
+        """
+        Vectorized calculate_decay. `fatigue` is (N, 4); `hours_passed` is a scalar or (N,).
+        """
+        days = np.asarray(hours_passed, dtype=float).reshape(-1, 1) / 24.0
+        if model == "exponential":
+            return fatigue * (1 - FatigueModel.DECAY_VECTOR) ** days
+        return np.maximum(0.0, fatigue - FatigueModel.DECAY_VECTOR * 100 * days)
+
+    @staticmethod
+    def impact_vector(session_type: str, rpe: int, duration_min: int) -> np.ndarray:
+        """Fatigue added per system by one session, in SYSTEMS order."""
+        impact = FatigueModel.IMPACT_MATRIX.get(session_type, FatigueModel.DEFAULT_IMPACT)
+        total_mult = (rpe / 5.0) * (duration_min / 45.0)
+        return np.array([impact.get(system, 0) for system in FatigueModel.SYSTEMS], dtype=float) * total_mult
+
+    @staticmethod
+    def apply_impact_batch(fatigue: np.ndarray, impacts: np.ndarray) -> np.ndarray:
+        """Vectorized apply_impact: add (N, 4) impacts and cap each system at 100."""
+        return np.minimum(100.0, fatigue + impacts)
@@ -2,14 +2,20 @@
 Fine-Tuning Service for AI Coach
 Collects training data from user interactions and prepares datasets for model fine-tuning.
 """
+import gzip
 import json
 import os
+import textwrap
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Iterator, List, Dict, Any
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from app.models.training_conversation import TrainingConversation
 from app.models.user import User
 
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = ("jsonl", "json")
+
 
 class FineTuningService:
     """
@@ -76,77 +82,138 @@ class FineTuningService:
         db: Session,
         min_rating: int = 4,
         format: str = "jsonl",
-        dataset_version: str = None
+        dataset_version: str = None,
+        compress: bool = False
     ) -> str:
         """
         Export high-quality conversations as training data.
-        Formats: 'jsonl' (for Gemini), 'csv', 'json'
+        Formats: 'jsonl' (for Gemini), 'json'. Written incrementally, optionally gzipped.
         """
-        # Query high-quality conversations
-        conversations = db.query(TrainingConversation).filter(
-            TrainingConversation.user_rating >= min_rating,
-            TrainingConversation.was_helpful == True,
-            TrainingConversation.included_in_training == False
-        ).all()
-        
+        self._check_format(format)
         if not dataset_version:
             dataset_version = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         filename = f"{self.training_data_dir}/training_data_{dataset_version}.{format}"
+        if compress:
+            filename += ".gz"
         
-        if format == "jsonl":
-            self._export_jsonl(conversations, filename, dataset_version, db)
-        elif format == "json":
-            self._export_json(conversations, filename, dataset_version, db)
+        opener = gzip.open if compress else open
+        with opener(filename, 'wt', encoding='utf-8') as f:
+            for chunk in self.iter_export(db, min_rating, format, dataset_version):
+                f.write(chunk)
         
         return filename
     
-    def _export_jsonl(self, conversations: List[TrainingConversation], filename: str, version: str, db: Session):
+    def iter_export(
+        self,
+        db: Session,
+        min_rating: int = 4,
+        format: str = "jsonl",
+        dataset_version: str = None,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[str]:
         """
-        Export in JSONL format for Gemini fine-tuning.
-        Format: {"text_input": "...", "output": "..."}
+        Yield the dataset as text chunks, one page of conversations at a time.
+        Pages are only read while streaming; once the whole export has been produced the
+        exported conversations are marked as included, one committed UPDATE per page, so
+        a slow download never holds a write transaction (or the SQLite writer lock).
         """
-        with open(filename, 'w', encoding='utf-8') as f:
-            for conv in conversations:
-                # Construct input with context
-                context_str = self._format_context(conv.user_context)
-                text_input = f"{conv.system_prompt}\n\nUser Context:\n{context_str}\n\nUser: {conv.user_message}"
-                
-                training_example = {
-                    "text_input": text_input,
-                    "output": conv.ai_response
-                }
-                f.write(json.dumps(training_example) + '\n')
-                
-                # Mark as included
-                conv.included_in_training = True
-                conv.training_dataset_version = version
-            
+        self._check_format(format)
+        if not dataset_version:
+            dataset_version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        formatter = self._format_json if format == "json" else self._format_jsonl
+        
+        exported: List[List[int]] = []
+        try:
+            if format == "json":
+                yield "["
+            first = True
+            for batch in self._iter_conversation_batches(db, min_rating, batch_size):
+                # End the read transaction before handing the page to a (possibly slow) client
+                db.rollback()
+                for conv in batch:
+                    if format == "json":
+                        yield ("\n" if first else ",\n") + formatter(conv)
+                    else:
+                        yield formatter(conv)
+                    first = False
+                exported.append([conv.id for conv in batch])
+            if format == "json":
+                yield "]" if first else "\n]"
+        except BaseException:
+            # Includes GeneratorExit when a download is abandoned: nothing gets marked
+            db.rollback()
+            raise
+        
+        # Mark as included
+        for ids in exported:
+            db.execute(
+                update(TrainingConversation)
+                .where(TrainingConversation.id.in_(ids))
+                .values(included_in_training=True, training_dataset_version=dataset_version)
+            )
             db.commit()
     
-    def _export_json(self, conversations: List[TrainingConversation], filename: str, version: str, db: Session):
+    @staticmethod
+    def _check_format(format: str) -> None:
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{format}'. Supported formats: {', '.join(EXPORT_FORMATS)}")
+    
+    def _iter_conversation_batches(self, db: Session, min_rating: int, batch_size: int) -> Iterator[List[Any]]:
+        """Keyset-paginate qualifying conversations by id, selecting only exported columns."""
+        last_id = 0
+        while True:
+            batch = db.execute(
+                select(
+                    TrainingConversation.id,
+                    TrainingConversation.user_message,
+                    TrainingConversation.ai_response,
+                    TrainingConversation.system_prompt,
+                    TrainingConversation.user_context,
+                    TrainingConversation.user_rating,
+                    TrainingConversation.created_at
+                ).where(
+                    TrainingConversation.id > last_id,
+                    TrainingConversation.user_rating >= min_rating,
+                    TrainingConversation.was_helpful == True,
+                    TrainingConversation.included_in_training == False
+                ).order_by(TrainingConversation.id).limit(batch_size)
+            ).all()
+            if not batch:
+                return
+            last_id = batch[-1].id
+            yield batch
+    
+    def _format_jsonl(self, conv) -> str:
         """
-        Export in JSON format for custom training pipelines.
+        JSONL line for Gemini fine-tuning.
+        Format: {"text_input": "...", "output": "..."}
         """
-        dataset = []
-        for conv in conversations:
-            dataset.append({
-                "id": conv.id,
-                "user_message": conv.user_message,
-                "ai_response": conv.ai_response,
-                "system_prompt": conv.system_prompt,
-                "context": conv.user_context,
-                "rating": conv.user_rating,
-                "timestamp": conv.created_at.isoformat()
-            })
-            
-            conv.included_in_training = True
-            conv.training_dataset_version = version
+        # Construct input with context
+        context_str = self._format_context(conv.user_context)
+        text_input = f"{conv.system_prompt}\n\nUser Context:\n{context_str}\n\nUser: {conv.user_message}"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(dataset, f, indent=2, ensure_ascii=False)
-        
-        db.commit()
+        training_example = {
+            "text_input": text_input,
+            "output": conv.ai_response
+        }
+        return json.dumps(training_example) + '\n'
+    
+    def _format_json(self, conv) -> str:
+        """
+        One element of the JSON array used by custom training pipelines.
+        Indented to match json.dump(dataset, indent=2).
+        """
+        item = {
+            "id": conv.id,
+            "user_message": conv.user_message,
+            "ai_response": conv.ai_response,
+            "system_prompt": conv.system_prompt,
+            "context": conv.user_context,
+            "rating": conv.user_rating,
+            "timestamp": conv.created_at.isoformat() if conv.created_at else None
+        }
+        return textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), "  ")
     
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format user context for training examples."""
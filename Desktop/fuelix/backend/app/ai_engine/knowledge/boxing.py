@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 
 class BoxingKnowledge:
     def get_moves(self) -> Dict[str, str]:
@@ -10,26 +11,33 @@ class BoxingKnowledge:
             "pull": "Pull", "pivot": "Pivot"
         }
 
-    def get_combos(self, difficulty: str = "Beginner") -> List[Dict[str, Any]]:
-        combos = [
-            # Beginner
-            {"seq": ["1", "2"], "diff": "Beginner", "type": "Fundamentals", "cost": "Low"},
-            {"seq": ["1", "1", "2"], "diff": "Beginner", "type": "Rhythm", "cost": "Low"},
-            {"seq": ["1", "2", "3"], "diff": "Beginner", "type": "Flow", "cost": "Low"},
-            {"seq": ["1", "slip_L", "3"], "diff": "Beginner", "type": "Defense", "cost": "Low"},
-            
-            # Intermediate
-            {"seq": ["1", "2", "roll_L", "3"], "diff": "Intermediate", "type": "Defense", "cost": "Medium"},
-            {"seq": ["1", "2", "3", "2"], "diff": "Intermediate", "type": "Power", "cost": "Medium"},
-            {"seq": ["1", "pull", "2", "3"], "diff": "Intermediate", "type": "Counter", "cost": "Medium"},
-            {"seq": ["6", "3", "2"], "diff": "Intermediate", "type": "Inside", "cost": "High"},
-            
-            # Advanced
-            {"seq": ["1", "slip_R", "throw_2", "roll_L", "3"], "diff": "Advanced", "type": "Technical", "cost": "High"},
-            {"seq": ["1", "1", "2", "pivot", "2"], "diff": "Advanced", "type": "Footwork", "cost": "High"},
-            {"seq": ["3", "roll_L", "3", "6", "roll_R", "2"], "diff": "Advanced", "type": "Inside Flow", "cost": "High"},
-        ]
-        return [c for c in combos if c["diff"] == difficulty]
+    # Read-only combos, grouped by difficulty once at import time
+    COMBOS = tuple(MappingProxyType(c) for c in [
+        # Beginner
+        {"seq": ("1", "2"), "diff": "Beginner", "type": "Fundamentals", "cost": "Low"},
+        {"seq": ("1", "1", "2"), "diff": "Beginner", "type": "Rhythm", "cost": "Low"},
+        {"seq": ("1", "2", "3"), "diff": "Beginner", "type": "Flow", "cost": "Low"},
+        {"seq": ("1", "slip_L", "3"), "diff": "Beginner", "type": "Defense", "cost": "Low"},
+        
+        # Intermediate
+        {"seq": ("1", "2", "roll_L", "3"), "diff": "Intermediate", "type": "Defense", "cost": "Medium"},
+        {"seq": ("1", "2", "3", "2"), "diff": "Intermediate", "type": "Power", "cost": "Medium"},
+        {"seq": ("1", "pull", "2", "3"), "diff": "Intermediate", "type": "Counter", "cost": "Medium"},
+        {"seq": ("6", "3", "2"), "diff": "Intermediate", "type": "Inside", "cost": "High"},
+        
+        # Advanced
+        {"seq": ("1", "slip_R", "throw_2", "roll_L", "3"), "diff": "Advanced", "type": "Technical", "cost": "High"},
+        {"seq": ("1", "1", "2", "pivot", "2"), "diff": "Advanced", "type": "Footwork", "cost": "High"},
+        {"seq": ("3", "roll_L", "3", "6", "roll_R", "2"), "diff": "Advanced", "type": "Inside Flow", "cost": "High"},
+    ])
+    _COMBOS_BY_DIFFICULTY: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+    for _combo in COMBOS:
+        _COMBOS_BY_DIFFICULTY[_combo["diff"]] = _COMBOS_BY_DIFFICULTY.get(_combo["diff"], ()) + (_combo,)
+    del _combo
+
+    def get_combos(self, difficulty: str = "Beginner") -> List[Mapping[str, Any]]:
+        """Combos for a difficulty. Entries are shared and read-only; copy before modifying."""
+        return list(self._COMBOS_BY_DIFFICULTY.get(difficulty, ()))
     
     def get_tactical_drills(self, focus: str) -> List[Dict[str, Any]]:
         if focus == "Defense":
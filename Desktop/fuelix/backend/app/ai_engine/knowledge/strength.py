@@ -1,4 +1,97 @@
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet
+
+# Muscle groups matched by each training focus ("Full Body" matches everything)
+FOCUS_MUSCLES = {
+    "Upper Body Strength": ["Chest", "Shoulders", "Back", "Lats", "Triceps", "Biceps", "Rear Delts"],
+    "Lower Body Strength": ["Quads", "Hamstrings", "Glutes", "Calves", "Legs", "Posterior Chain"],
+    "Push": ["Chest", "Shoulders", "Triceps"],
+    "Pull": ["Back", "Lats", "Biceps", "Rear Delts"],
+    "Legs": ["Quads", "Hamstrings", "Glutes", "Calves", "Legs"],
+    "Core": ["Core", "Abs", "Obliques"],
+}
+
+# Equipment item required when any of the name markers appears in an exercise name
+EQUIPMENT_MARKERS = {
+    "barbell": ["Barbell"],
+    "dumbbells": ["DB", "Dumbbell"],
+    "cables": ["Cable"],
+    "machines": ["Machine"],
+    "kettlebells": ["Kettlebell", "KB"],
+}
+
+# Movements to avoid per injured body part, as exercise-name keywords. Together with each
+# exercise's `flags` these give one exclusion set per body part (index["exclude"]).
+INJURY_RULES = {
+    "shoulder": ["overhead", "bench_press", "dips", "heavy_bag"],
+    "knee": ["squat", "lunge", "jump", "run"],
+    "lower_back": ["deadlift", "bent_row", "situp"],
+}
+
+# Distinct blocked sets resolved by StrengthKnowledge.excluded_ids
+EXCLUSION_CACHE_SIZE = 256
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def keyword_ids(exercise_db: List[Dict[str, Any]], keyword: str) -> FrozenSet[int]:
+    """
+    IDs of exercises whose name contains the keyword's words in order, each word
+    matching the start of a name word ("lunge" -> "Walking Lunges", but "run" != "Crunches").
+    """
+    target = _words(keyword)
+    ids = set()
+    if not target:
+        return frozenset()
+    for i, ex in enumerate(exercise_db):
+        words = _words(ex["name"])
+        for start in range(len(words) - len(target) + 1):
+            if all(w.startswith(t) for w, t in zip(words[start:], target)):
+                ids.add(i)
+                break
+    return frozenset(ids)
+
+
+def build_exercise_index(exercise_db: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Precomputes frozensets of exercise IDs (positions in exercise_db) per focus,
+    muscle group, injury flag and required equipment, so lookups become set operations.
+    """
+    by_muscle: Dict[str, set] = {}
+    by_flag: Dict[str, set] = {}
+    by_equipment: Dict[str, set] = {item: set() for item in EQUIPMENT_MARKERS}
+    
+    for i, ex in enumerate(exercise_db):
+        by_muscle.setdefault(ex["muscle"], set()).add(i)
+        for flag in ex["flags"]:
+            by_flag.setdefault(flag, set()).add(i)
+        for item, markers in EQUIPMENT_MARKERS.items():
+            if any(marker in ex["name"] for marker in markers):
+                by_equipment[item].add(i)
+    
+    muscle = {m: frozenset(ids) for m, ids in by_muscle.items()}
+    flag = {f: frozenset(ids) for f, ids in by_flag.items()}
+    keyword = {kw: keyword_ids(exercise_db, kw) for kws in INJURY_RULES.values() for kw in kws}
+    return {
+        "all": frozenset(range(len(exercise_db))),
+        "muscle": muscle,
+        "focus": {
+            focus: frozenset().union(*(muscle.get(m, frozenset()) for m in muscles))
+            for focus, muscles in FOCUS_MUSCLES.items()
+        },
+        "flag": flag,
+        "keyword": keyword,
+        # Body part -> every exercise to drop for it: flagged ones plus rule keyword matches
+        "exclude": {
+            part: flag.get(part, frozenset()).union(*(keyword[kw] for kw in INJURY_RULES.get(part, ())))
+            for part in flag.keys() | INJURY_RULES.keys()
+        },
+        "equipment": {item: frozenset(ids) for item, ids in by_equipment.items()},
+    }
+
 
 class StrengthKnowledge:
     EXERCISE_DB = [
@@ -163,46 +256,39 @@ class StrengthKnowledge:
         {"name": "Battle Ropes", "type": "Power", "muscle": "Shoulders", "secondary": ["Core", "Cardio"], "cns": 5, "flags": ["shoulder"], "subs": ["KB Swing"]},
     ]
 
+    # Built once at import time; EXERCISE_DB is treated as immutable
+    _INDEX = build_exercise_index(EXERCISE_DB)
+
+    @staticmethod
+    @lru_cache(maxsize=EXCLUSION_CACHE_SIZE)
+    def excluded_ids(blocked: FrozenSet[str]) -> FrozenSet[int]:
+        """
+        Exercise IDs to drop for a set of injured body parts and/or movement keywords
+        (RecoveryLogic.get_blocked_movements returns both). Cached per distinct set.
+        """
+        idx = StrengthKnowledge._INDEX
+        excluded = set()
+        for term in blocked:
+            term = term.lower()
+            ids = idx["exclude"].get(term) or idx["keyword"].get(term)
+            excluded.update(ids if ids is not None else keyword_ids(StrengthKnowledge.EXERCISE_DB, term))
+        return frozenset(excluded)
 
     def get_exercises(self, focus: str, equipment: List[str], blocked_flags: List[str]) -> List[Dict[str, Any]]:
-        valid = []
-        for ex in self.EXERCISE_DB:
-            # 1. Check Injury Flags
-            if any(flag in blocked_flags for flag in ex["flags"]):
-                continue
-            
-            # 2. Check Equipment (Simple heuristic)
-            if "Barbell" in ex["name"] and "barbell" not in equipment: continue
-            if "DB" in ex["name"] or "Dumbbell" in ex["name"]:
-                if "dumbbells" not in equipment: continue
-            if "Cable" in ex["name"] and "cables" not in equipment: continue
-            if "Machine" in ex["name"] and "machines" not in equipment: continue
-            if "Kettlebell" in ex["name"] or "KB" in ex["name"]:
-                if "kettlebells" not in equipment: continue
-            
-            # 3. Check Focus
-            if focus == "Upper Body Strength":
-                if ex["muscle"] in ["Chest", "Shoulders", "Back", "Lats", "Triceps", "Biceps", "Rear Delts"]: 
-                    valid.append(ex)
-            elif focus == "Lower Body Strength":
-                if ex["muscle"] in ["Quads", "Hamstrings", "Glutes", "Calves", "Legs", "Posterior Chain"]: 
-                    valid.append(ex)
-            elif focus == "Push":
-                if ex["muscle"] in ["Chest", "Shoulders", "Triceps"]:
-                    valid.append(ex)
-            elif focus == "Pull":
-                if ex["muscle"] in ["Back", "Lats", "Biceps", "Rear Delts"]:
-                    valid.append(ex)
-            elif focus == "Legs":
-                if ex["muscle"] in ["Quads", "Hamstrings", "Glutes", "Calves", "Legs"]:
-                    valid.append(ex)
-            elif focus == "Full Body":
-                valid.append(ex)
-            elif focus == "Core":
-                if ex["muscle"] in ["Core", "Abs", "Obliques"]:
-                    valid.append(ex)
+        idx = self._INDEX
+        # 1. Check Focus
+        candidates = idx["all"] if focus == "Full Body" else idx["focus"].get(focus, frozenset())
+        
+        # 2. Check Injuries (body parts and movement keywords), one set difference
+        if blocked_flags:
+            candidates = candidates - self.excluded_ids(frozenset(blocked_flags))
+        
+        # 3. Check Equipment (Simple heuristic)
+        for item, ids in idx["equipment"].items():
+            if item not in equipment:
+                candidates = candidates - ids
                 
-        return valid
+        return [self.EXERCISE_DB[i] for i in sorted(candidates)]
 
     def get_substitute(self, exercise_name: str) -> str:
         for ex in self.EXERCISE_DB:
@@ -1,36 +1,62 @@
 import os
 import google.generativeai as genai
 from typing import Optional
+from app.core.config import settings
+from .response_cache import ResponseCache
+
+# Shared across LLMService instances so every caller benefits from the same cache
+response_cache = ResponseCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    db_path=settings.LLM_CACHE_DB_PATH
+) if settings.LLM_CACHE_ENABLED else None
 
 class LLMService:
     """
     Interfaces with Google Gemini API.
     Refalls to a 'Simulated Intelligence' if no API key is present.
+    Responses are cached per (model, system prompt, user message).
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.api_key = os.getenv("GEMINI_API_KEY")
         if self.api_key:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-pro')
+            self.model_name = 'gemini-pro'
+            self.model = genai.GenerativeModel(self.model_name)
         else:
+            self.model_name = 'simulated'
             self.model = None
+        self.cache = cache if cache is not None else response_cache
 
     def generate_response(self, system_prompt: str, user_message: str) -> str:
+        key = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(self.model_name, system_prompt, user_message)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         if self.model:
             try:
                 chat = self.model.start_chat(history=[
                     {"role": "user", "parts": [system_prompt]}
                 ])
                 response = chat.send_message(user_message)
-                return response.text
+                text = response.text
             except Exception as e:
                 print(f"LLM Error: {e}")
+                # Don't cache the fallback, the next call should retry the model
                 return self._simulate_intelligence(user_message)
         else:
-            return self._simulate_intelligence(user_message)
+            text = self._simulate_intelligence(user_message)
+
+        if key is not None:
+            self.cache.set(key, text)
+        return text
 
-    def _simulate_intelligence(self, message: str) -> str:
+    @staticmethod
+    def _simulate_intelligence(message: str) -> str:
         """
         Sophisticated rule-based responses for demo purposes when offline.
         """
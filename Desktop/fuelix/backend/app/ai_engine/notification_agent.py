@@ -1,10 +1,10 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 from typing import List
+from app.db.upsert import dialect_insert
 from app.models.user import User
 from app.models.daily_task import DailyTask, TaskCategory, TaskPriority
-from app.models.athlete_state import AthleteState
-from app.models.daily_log import DailyLog
 # from app.ai_engine.workout_generator import WorkoutGenerator # Circular dependency risk if not careful
 
 class NotificationAgent:
@@ -13,89 +13,96 @@ class NotificationAgent:
     Acts as the 'Executive Function' for the athlete.
     """
     
+    # The plan every athlete gets each day (see _plan_rows)
+    DAILY_PLAN = [
+        # 1. Training Task - links to the Workout Generator
+        {"title": "Daily Training Session", "message": "Your adaptive plan is ready. Tap to view.",
+         "category": "training", "priority": "high"},
+        # 2. Nutrition Task
+        {"title": "Log Nutrition", "message": "Track your meals to stay on target.",
+         "category": "nutrition", "priority": "medium"},
+        # 3. Mindset/Recovery Check-in
+        {"title": "Recovery Check", "message": "How are you feeling? Log your metrics.",
+         "category": "recovery", "priority": "low"},
+    ]
+    
     def get_or_create_daily_tasks(self, user: User, db: Session) -> List[DailyTask]:
         """
-        Fetches today's tasks. If none exist, generates them based on current state.
+        Fetches today's tasks, normally pre-generated by pregenerate_daily_tasks.
+        If the batch job hasn't covered this user yet, generates them on the spot.
         """
         today = date.today()
-        # Query tasks for today
-        start_of_day = datetime.combine(today, datetime.min.time())
-        end_of_day = datetime.combine(today, datetime.max.time())
-        
-        tasks = db.query(DailyTask).filter(
-            DailyTask.user_id == user.id, 
-            DailyTask.due_date >= start_of_day,
-            DailyTask.due_date <= end_of_day
-        ).all()
+        tasks = self._read_tasks(user.id, today, db)
         
         if not tasks:
-            tasks = self._generate_daily_plan(user, db)
+            try:
+                self._insert_plans([user.id], today, db)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Error creating tasks: {e}")
+                return []
+            # A concurrent request may have inserted first; either way read what's stored
+            tasks = self._read_tasks(user.id, today, db)
         
         return tasks
 
-    def _generate_daily_plan(self, user: User, db: Session) -> List[DailyTask]:
+    def pregenerate_daily_tasks(self, db: Session, day: date, batch_size: int = 500) -> int:
         """
-        The Brain: Decides what the user needs to do today.
+        Batch job: create `day`'s plan for every active user with bulk inserts.
+        Idempotent - tasks that already exist are skipped. Returns users processed.
         """
-        new_tasks = []
-        state = db.query(AthleteState).filter(AthleteState.user_id == user.id).first()
+        processed = 0
+        last_id = 0
+        while True:
+            user_ids = [row[0] for row in db.query(User.id).filter(
+                User.id > last_id,
+                User.is_active == True
+            ).order_by(User.id).limit(batch_size).all()]
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+            
+            self._insert_plans(user_ids, day, db)
+            db.commit()
+            processed += len(user_ids)
         
-        # 1. Training Task
-        # Check fatigue to determine tone
-        fatigue_high = False
-        if state and (state.cns_fatigue > 8.0 or state.muscular_fatigue_lower > 8.0): # Assuming 0-10 or 0-100 scale? previous code used 0-100% logic in UI but 0-10 in rules. Let's assume 0-10 for consistency with RPE or handle scaling. 
-            # If rules.py uses 0-10 for fatigue, we assume state stores analogous value. 
-            # Let looks at AthleteState Definition: cns_fatigue is Float.
-            pass
+        return processed
 
-        # For MVP, let's create a generic Training Task that links to the Workout Generator
-        new_task_training = DailyTask(
-            user_id=user.id,
-            title="Daily Training Session",
-            message="Your adaptive plan is ready. Tap to view.",
-            category="training", # Using string for simplicity to avoid Enum issues with SQLite sometimes
-            priority="high",
-            due_date=datetime.now(),
-            is_completed=False
-        )
-        new_tasks.append(new_task_training)
+    def _read_tasks(self, user_id: int, day: date, db: Session) -> List[DailyTask]:
+        start_of_day = datetime.combine(day, datetime.min.time())
+        end_of_day = datetime.combine(day, datetime.max.time())
         
-        # 2. Nutrition Task
-        new_tasks.append(DailyTask(
-             user_id=user.id,
-             title="Log Nutrition",
-             message="Track your meals to stay on target.",
-             category="nutrition",
-             priority="medium",
-             due_date=datetime.now(),
-             is_completed=False
-        ))
+        return db.query(DailyTask).filter(
+            DailyTask.user_id == user_id, 
+            DailyTask.due_date >= start_of_day,
+            DailyTask.due_date <= end_of_day
+        ).order_by(DailyTask.id).all()
 
-        # 3. Mindset/Recovery Check-in
-        new_tasks.append(DailyTask(
-             user_id=user.id,
-             title="Recovery Check",
-             message="How are you feeling? Log your metrics.",
-             category="recovery",
-             priority="low",
-             due_date=datetime.now(),
-             is_completed=False
-        ))
+    def _plan_rows(self, user_id: int, day: date) -> List[dict]:
+        """
+        The Brain: Decides what the user needs to do on `day`.
+        """
+        due_date = datetime.combine(day, datetime.min.time())
+        return [
+            dict(task, user_id=user_id, due_date=due_date, is_completed=False, created_at=datetime.utcnow())
+            for task in self.DAILY_PLAN
+        ]
 
-        # Save to DB
-        try:
-            for t in new_tasks:
-                db.add(t)
-            db.commit()
-            # Refresh to get IDs
-            for t in new_tasks:
-                db.refresh(t)
-        except Exception as e:
-            db.rollback()
-            print(f"Error creating tasks: {e}")
-            return []
+    def _insert_plans(self, user_ids: List[int], day: date, db: Session) -> None:
+        rows = [row for user_id in user_ids for row in self._plan_rows(user_id, day)]
+        insert = dialect_insert(db)
+        if insert is not None:
+            # Conflicts on (user_id, due_date, title) mean the task already exists
+            db.execute(insert(DailyTask).values(rows).on_conflict_do_nothing())
+            return
         
-        return new_tasks
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    db.execute(DailyTask.__table__.insert().values(**row))
+            except IntegrityError:
+                pass
 
     def complete_task(self, task_id: int, db: Session) -> bool:
         task = db.query(DailyTask).filter(DailyTask.id == task_id).first()
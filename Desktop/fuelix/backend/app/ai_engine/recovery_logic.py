@@ -1,27 +1,134 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import and_, event, literal, select
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.injury import Injury, InjuryStatus
 from app.models.athlete_state import AthleteState
 from app.models.daily_log import DailyLog
+from app.ai_engine.knowledge.strength import INJURY_RULES
+from app.services.fatigue_state import fatigue_at
 from datetime import date
 
+class ReadinessSnapshot:
+    """
+    Everything readiness and movement blocking need for one user: active injuries,
+    AthleteState and today's DailyLog, fetched in a single round-trip.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        state: Optional[AthleteState],
+        today_log: Optional[DailyLog],
+        active_injuries: List[Injury]
+    ):
+        self.user_id = user_id
+        self.state = state
+        self.today_log = today_log
+        self.active_injuries = active_injuries
+
+    @staticmethod
+    def load(user_id: int, db: Session, today: Optional[date] = None) -> "ReadinessSnapshot":
+        """
+        One query: state and today's log are at most one row each, so they repeat on
+        every active-injury row (or come back once, with no injury, when there are none).
+        """
+        today = today or date.today()
+        anchor = select(literal(user_id).label("user_id")).subquery("anchor")
+        stmt = (
+            select(AthleteState, DailyLog, Injury)
+            .select_from(anchor)
+            .outerjoin(AthleteState, AthleteState.user_id == anchor.c.user_id)
+            .outerjoin(DailyLog, and_(DailyLog.user_id == anchor.c.user_id, DailyLog.date == today))
+            .outerjoin(Injury, and_(
+                Injury.user_id == anchor.c.user_id,
+                Injury.status != InjuryStatus.HEALED.value
+            ))
+            .order_by(Injury.id)
+        )
+        rows = db.execute(stmt).all()
+        first = rows[0] if rows else (None, None, None)
+        return ReadinessSnapshot(
+            user_id,
+            state=first[0],
+            today_log=first[1],
+            active_injuries=[row[2] for row in rows if row[2] is not None]
+        )
+
+    @staticmethod
+    def load_many(user_ids: Iterable[int], db: Session, today: Optional[date] = None) -> Dict[int, "ReadinessSnapshot"]:
+        """Snapshots for many users (e.g. a team plan): one query per table instead of one per user."""
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return {}
+        today = today or date.today()
+        states = {s.user_id: s for s in db.scalars(select(AthleteState).where(AthleteState.user_id.in_(user_ids)))}
+        logs = {
+            log.user_id: log for log in
+            db.scalars(select(DailyLog).where(DailyLog.user_id.in_(user_ids), DailyLog.date == today))
+        }
+        injuries: Dict[int, List[Injury]] = {}
+        for injury in db.scalars(
+            select(Injury)
+            .where(Injury.user_id.in_(user_ids), Injury.status != InjuryStatus.HEALED.value)
+            .order_by(Injury.id)
+        ):
+            injuries.setdefault(injury.user_id, []).append(injury)
+        return {
+            uid: ReadinessSnapshot(uid, states.get(uid), logs.get(uid), injuries.get(uid, []))
+            for uid in user_ids
+        }
+
+    @staticmethod
+    def for_request(user_id: int, db: Session) -> "ReadinessSnapshot":
+        """
+        Memoized on the session, i.e. per request: readiness and blocked movements for
+        the same user share one load. Dropped when the session commits or rolls back,
+        or flushes a change to any of the tables it was loaded from.
+        """
+        snapshots = db.info.setdefault("readiness_snapshots", {})
+        snapshot = snapshots.get(user_id)
+        if snapshot is None:
+            snapshot = snapshots[user_id] = ReadinessSnapshot.load(user_id, db)
+        return snapshot
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_committed_snapshots(session):
+    session.info.pop("readiness_snapshots", None)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back_snapshots(session, previous_transaction):
+    session.info.pop("readiness_snapshots", None)
+
+# Models a snapshot is built from
+SNAPSHOT_MODELS = (AthleteState, DailyLog, Injury)
+
+@event.listens_for(Session, "after_flush")
+def _drop_flushed_snapshots(session, flush_context):
+    # new/dirty/deleted still hold what this flush wrote
+    if "readiness_snapshots" in session.info and any(
+        isinstance(obj, SNAPSHOT_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info.pop("readiness_snapshots", None)
+
+
 class RecoveryLogic:
     """
     Sports Science Engine for calculating readiness and managing injuries.
     """
 
-    def calculate_readiness(self, user: User, db: Session) -> dict:
+    def calculate_readiness(self, user: User, db: Session, snapshot: Optional[ReadinessSnapshot] = None) -> dict:
         """
         Calculates a 0-100 score based on Injuries, Fatigue, and Recovery logs.
         """
+        snapshot = snapshot or ReadinessSnapshot.for_request(user.id, db)
         score = 100.0
         details = []
 
         # 1. Injury Penalty
-        active_injuries = db.query(Injury).filter(
-            Injury.user_id == user.id, 
-            Injury.status != InjuryStatus.HEALED.value
-        ).all()
+        active_injuries = snapshot.active_injuries
         
         injury_penalty = 0
         for injury in active_injuries:
@@ -34,16 +141,18 @@ class RecoveryLogic:
         score -= injury_penalty
 
         # 2. Fatigue Penalty (from AthleteState)
-        state = db.query(AthleteState).filter(AthleteState.user_id == user.id).first()
+        state = snapshot.state
         if state:
-            avg_fatigue = (state.cns_fatigue + state.muscular_fatigue_lower + state.muscular_fatigue_upper) / 3
-            if avg_fatigue > 5: # Assuming 0-10 scale
-                fatigue_penalty = (avg_fatigue - 5) * 5
+            # Stored fatigue decayed to now (0-100 scale), no session history needed
+            fatigue = fatigue_at(state)
+            avg_fatigue = (fatigue["cns_fatigue"] + fatigue["muscular_lower_fatigue"] + fatigue["muscular_upper_fatigue"]) / 3
+            if avg_fatigue > 50:
+                fatigue_penalty = (avg_fatigue - 50) * 0.5
                 score -= fatigue_penalty
                 details.append(f"Systemic Fatigue: -{fatigue_penalty:.1f}")
 
         # 3. Sleep/Recovery Bonus/Penalty (from DailyLog)
-        today_log = db.query(DailyLog).filter(DailyLog.user_id == user.id, DailyLog.date == date.today()).first()
+        today_log = snapshot.today_log
         if today_log and today_log.sleep_hours:
             if today_log.sleep_hours < 6:
                 score -= 10
@@ -66,23 +175,23 @@ class RecoveryLogic:
             "active_injuries": [i.body_part for i in active_injuries]
         }
 
-    def get_blocked_movements(self, user: User, db: Session) -> list:
+    def get_blocked_movements(self, user: User, db: Session, snapshot: Optional[ReadinessSnapshot] = None) -> list:
         """
-        Returns a list of keywords/tags to avoid in workout generation.
+        Returns the injured body parts plus their movement keywords to avoid in workout
+        generation. StrengthKnowledge resolves both to exercise IDs (flags + INJURY_RULES).
         """
-        blocked = []
-        active_injuries = db.query(Injury).filter(
-            Injury.user_id == user.id, 
-            Injury.status != InjuryStatus.HEALED.value
-        ).all()
+        snapshot = snapshot or ReadinessSnapshot.for_request(user.id, db)
+        return self.blocked_for_injuries(snapshot.active_injuries)
 
-        for injury in active_injuries:
+    @staticmethod
+    def blocked_for_injuries(injuries: Iterable[Injury]) -> list:
+        """Body parts plus their INJURY_RULES keywords for a set of active injuries."""
+        blocked = set()
+        for injury in injuries:
             part = injury.body_part.lower()
-            if part == "shoulder":
-                blocked.extend(["overhead", "bench_press", "dips", "heavy_bag"])
-            elif part == "knee":
-                blocked.extend(["squat", "lunge", "jump", "run"])
-            elif part == "lower_back":
-                blocked.extend(["deadlift", "bent_row", "situp"])
+            if part == "general":
+                continue
+            blocked.add(part)
+            blocked.update(INJURY_RULES.get(part, ()))
         
-        return list(set(blocked))
+        return sorted(blocked)
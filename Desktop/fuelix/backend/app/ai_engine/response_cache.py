@@ -0,0 +1,113 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache for LLM responses with per-entry TTL.
+    Optionally backed by a SQLite file so cached answers survive restarts; expired rows
+    there are purged at most once per `purge_interval_seconds`, not on every write.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        db_path: Optional[str] = None,
+        purge_interval_seconds: float = 60
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._next_purge = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_expires_at "
+                "ON llm_response_cache (expires_at)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model_name: str, system_prompt: str, user_message: str) -> str:
+        """Hash of the prompt pair plus model name, ignoring leading/trailing whitespace."""
+        normalized = [part.strip() for part in (model_name, system_prompt, user_message)]
+        return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+
+            # Fall through to the persistent tier
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM llm_response_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._store(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._store(key, response, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, response, expires_at)
+                )
+                if now >= self._next_purge:
+                    # Range delete on the expires_at index
+                    self._db.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+                    self._next_purge = now + self.purge_interval_seconds
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_response_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None
+        }
+
+    def _store(self, key: str, response: str, expires_at: float) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,205 @@
+"""
+Precompiled workout templates.
+
+Everything in a session that depends only on the workout type and difficulty
+(parameter tables, warm-ups, fixed drills, titles) is compiled once per key into
+frozen tuples of read-only exercise mappings. WorkoutGenerator only computes the
+per-request parts (fatigue-driven focus, shuffled selections, duration) and copies
+the frozen entries into fresh dicts for the response.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping
+from .knowledge import KnowledgeBase
+
+kb = KnowledgeBase()
+
+Exercise = Mapping[str, Any]
+
+# Templates are keyed on client-supplied strings, so bound the caches
+TEMPLATE_CACHE_SIZE = 64
+
+
+def exercise(name: str, sets: int, reps: str, rest: str, note: str) -> Exercise:
+    return MappingProxyType({"name": name, "sets": sets, "reps": reps, "rest": rest, "note": note})
+
+
+def materialize(*parts: Iterable[Exercise]) -> List[Dict[str, Any]]:
+    """Copy frozen entries into the mutable exercise dicts handed to callers."""
+    # mappingproxy.copy() is a plain dict copy of the underlying mapping, cheaper than dict(proxy)
+    return [entry.copy() for part in parts for entry in part]
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def boxing_template(difficulty: str) -> Mapping[str, Any]:
+    # Difficulty-specific parameters
+    if difficulty == "Beginner":
+        rounds, round_duration, rest_between, num_combos, intensity = 3, "2 min", "1 min", 3, "Moderate"
+    elif difficulty == "Advanced":
+        rounds, round_duration, rest_between, num_combos, intensity = 6, "3 min", "45s", 5, "Very High"
+    else:  # Intermediate
+        rounds, round_duration, rest_between, num_combos, intensity = 5, "3 min", "1 min", 4, "High"
+
+    # Warmup - More comprehensive
+    exercises = [
+        exercise("Jump Rope", 2 if difficulty == "Beginner" else 3, round_duration, "1 min", "Rhythm & Cardio"),
+        exercise("Shadowboxing (Loose)", 1, "3 min", "1 min", "Flow, no power"),
+        exercise("Dynamic Stretches", 1, "5 min", "0s", "Arm circles, leg swings, torso twists"),
+    ]
+
+    # Skill Block (Combos)
+    for c in kb.boxing.get_combos(difficulty)[:num_combos]:
+        exercises.append(exercise(
+            f"Combo: {'-'.join(c['seq'])}", rounds, round_duration, rest_between, f"{c['type']} - {c['cost']} Cost"
+        ))
+
+    # Defense / Tactical
+    if difficulty != "Beginner":
+        drills = kb.boxing.get_tactical_drills("Defense")
+        exercises.extend(exercise(d["name"], 3, d["duration"], "1 min", d["desc"]) for d in drills[:2])
+
+    # Heavy Bag, Speed Work
+    exercises.append(exercise("Heavy Bag Power Rounds", 3, "2 min", "1 min", "Focus on power and technique"))
+    exercises.append(exercise("Speed Bag", 3, "1 min", "30s", "Hand-eye coordination"))
+
+    # Conditioning finisher
+    if difficulty == "Advanced":
+        exercises.append(exercise("Burpees", 3, "15", "45s", "Explosive conditioning"))
+        exercises.append(exercise("Mountain Climbers", 3, "30s", "30s", "Core & cardio"))
+    else:
+        exercises.append(exercise("Burpees", 2, "10", "1 min", "Conditioning"))
+
+    # Cool down
+    exercises.append(exercise("Light Shadowboxing", 1, "2 min", "0s", "Cool down, technique focus"))
+
+    return MappingProxyType({
+        "title": f"{difficulty} Boxing Session",
+        "focus": "Skill & Conditioning",
+        "exercises": tuple(exercises),
+        "intensity": intensity,
+        "reasoning": f"{difficulty} boxing program with {num_combos} combinations, {rounds} rounds per drill, and comprehensive conditioning. Total exercises: {len(exercises)}"
+    })
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def strength_template(focus: str, difficulty: str) -> Mapping[str, Any]:
+    # Professional Volume Parameters
+    if difficulty == "Beginner":
+        vol = {"main_sets": 3, "main_reps": "5-8", "sec_sets": 3, "sec_reps": "8-10", "acc_sets": 2, "acc_reps": "12-15"}
+        intensity = "Moderate"
+        rest = {"compound": "2-3 min", "accessory": "60-90s"}
+    elif difficulty == "Advanced":
+        vol = {"main_sets": 5, "main_reps": "3-5", "sec_sets": 4, "sec_reps": "6-8", "acc_sets": 3, "acc_reps": "10-12"}
+        intensity = "High (RPE 8-9)"
+        rest = {"compound": "3-5 min", "accessory": "90s"}
+    else:  # Intermediate
+        vol = {"main_sets": 4, "main_reps": "5-6", "sec_sets": 3, "sec_reps": "8-12", "acc_sets": 3, "acc_reps": "10-15"}
+        intensity = "Moderate-High (RPE 7-8)"
+        rest = {"compound": "2-3 min", "accessory": "60-90s"}
+
+    # Dynamic Warmup (Specific to focus)
+    warmup_drills = []
+    if "Lower" in focus or "Leg" in focus or "Full" in focus:
+        warmup_drills.extend(["90/90 Hip Switch", "World's Greatest Stretch"])
+    if "Upper" in focus or "Push" in focus or "Pull" in focus or "Full" in focus:
+        warmup_drills.extend(["Band Pull Aparts", "Thoracic Rotations"])
+
+    target_acc_count = 3 if difficulty == "Beginner" else 4
+    if difficulty == "Advanced":
+        target_acc_count = 5
+
+    return MappingProxyType({
+        "title": f"Pro {focus} - {difficulty}",
+        "intensity": intensity,
+        "vol": MappingProxyType(vol),
+        "rest": MappingProxyType(rest),
+        "warmup": (exercise(
+            "Dynamic Warmup Sequence", 1, "5-8 min", "0s",
+            f"Flow through: {', '.join(warmup_drills)}. Increase body temp."
+        ),),
+        "primary_note": f"PRIMARY STRENGTH. Focus on perfect form. {intensity}.",
+        "tertiary": difficulty in ["Intermediate", "Advanced"],
+        "target_acc_count": target_acc_count,
+    })
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def athletic_template(difficulty: str, fresh: bool) -> Mapping[str, Any]:
+    # Dynamic Warmup
+    exercises = [exercise(d["name"], 2, "20 yards", "0s", "Dynamic Warmup") for d in kb.athletic.get_warmup("Standard")]
+
+    # Power / Plyo, only when CNS is fresh
+    if fresh:
+        exercises.append(exercise("Box Jumps", 3, "5", "2 min", "Max Height"))
+        exercises.append(exercise("Med Ball Slams", 3, "8", "90s", "Explosive Power"))
+
+    # Speed / Agility
+    exercises.append(exercise("Ladder Drills", 4, "45s", "1 min", "Foot speed"))
+
+    return MappingProxyType({
+        "title": f"{difficulty} Athletic Performance",
+        "focus": "Power & Agility",
+        "exercises": tuple(exercises),
+        "intensity": "High",
+        "reasoning": "Focusing on explosive power and multidirectional speed."
+    })
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def cardio_template(difficulty: str) -> Mapping[str, Any]:
+    """
+    Fixed blocks around the main protocol. The protocol itself depends on CNS fatigue and
+    runs for the session duration minus `protocol_offset` minutes, so it is filled per request.
+    """
+    if difficulty == "Beginner":
+        template = {
+            "head": (exercise("Walking Warmup", 1, "5 min", "0s", "Easy pace"),),
+            "tail": (exercise("Cool Down Walk", 1, "5 min", "0s", "Recovery"),),
+            "protocol_offset": 10,
+            "intensity": "Low-Moderate",
+            "reasoning": "Beginner-friendly steady-state cardio. Build aerobic base with {protocol}.",
+        }
+    elif difficulty == "Advanced":
+        template = {
+            "head": (
+                exercise("Dynamic Warmup", 1, "5 min", "0s", "Prep for intensity"),
+                exercise("HIIT Intervals", 8, "30s work / 30s rest", "0s", "Max effort sprints"),
+            ),
+            "tail": (exercise("Active Recovery", 1, "5 min", "0s", "Light movement"),),
+            "protocol_offset": 20,
+            "intensity": "Very High",
+            "reasoning": "Advanced HIIT protocol with {protocol}. High calorie burn and conditioning.",
+        }
+    else:  # Intermediate
+        template = {
+            "head": (
+                exercise("Warmup", 1, "5 min", "0s", "Gradual intensity build"),
+                exercise("Tempo Intervals", 4, "3 min work / 2 min easy", "0s", "Moderate-high effort"),
+            ),
+            "tail": (exercise("Cool Down", 1, "5 min", "0s", "Easy pace"),),
+            "protocol_offset": 25,
+            "intensity": "Moderate-High",
+            "reasoning": "Intermediate cardio with tempo work and {protocol}. Balanced conditioning.",
+        }
+    return MappingProxyType(template)
+
+
+def cardio_goal(difficulty: str, cns: float) -> str:
+    if difficulty == "Beginner":
+        return "Endurance"
+    if difficulty == "Advanced":
+        return "Fat Loss"
+    return "Fat Loss" if cns < 50 else "Endurance"
+
+
+RECOVERY_TEMPLATE: Mapping[str, Any] = MappingProxyType({
+    "title": "Active Recovery",
+    "focus": "Mobility & Flow",
+    "exercises": (
+        exercise("Dynamic Stretching", 1, "5 min", "0s", "Flow"),
+        exercise("Foam Rolling", 1, "10 min", "0s", "Myofascial Release"),
+        exercise("Light Yoga Flow", 1, "10 min", "0s", "Decompression"),
+    ),
+    "intensity": "Low",
+    "reasoning": "High CNS fatigue detected. Focus on restoration."
+})
@@ -1,10 +1,14 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import asyncio
+import copy
+import time
+from typing import Any, Awaitable, Dict, Generator, Optional, TypeVar
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.user import User
@@ -14,6 +18,16 @@ reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/access-token"
 )
 
+T = TypeVar("T")
+
+# Verified tokens (signature -> user id), each kept until the token's own `exp`
+token_cache = TTLCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE)
+# User column values by id, short-lived; invalidate_user() on profile changes
+user_cache = TTLCache(
+    max_entries=settings.AUTH_USER_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
 def get_db() -> Generator:
     """
     Database session dependency.
@@ -21,16 +35,18 @@ def get_db() -> Generator:
     """
     try:
         db = SessionLocal()
-        yield db
     except Exception as e:
         print(f"Database connection failed: {e}")
         # Yield None if database is unavailable
         yield None
+        return
+    try:
+        # Errors raised by the endpoint propagate; only session setup falls back to None
+        yield db
     finally:
         try:
-            if db:
-                db.close()
-        except:
+            db.close()
+        except Exception:
             pass
 
 def get_current_user(
@@ -38,7 +54,26 @@ def get_current_user(
 ) -> User:
     if token == "mock_token_for_dev":
         return get_mock_user(db)
-        
+    
+    user_id = _verify_token(token)
+    
+    values = user_cache.get(user_id)
+    if values is not None:
+        return _user_from_cache(values, db)
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(user_id, {c.key: getattr(user, c.key) for c in User.__table__.columns})
+    return user
+
+def _verify_token(token: str) -> int:
+    """Decode and validate the JWT once; later requests with the same token hit the cache."""
+    signature = token.rsplit(".", 1)[-1]
+    user_id = token_cache.get(signature)
+    if user_id is not None:
+        return user_id
+    
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -49,11 +84,29 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
+    if token_data.sub is None:
         raise HTTPException(status_code=404, detail="User not found")
+    
+    # Never cache past expiry; tokens without `exp` get the user-cache TTL only
+    expires_at = payload.get("exp") or time.time() + settings.AUTH_USER_CACHE_TTL_SECONDS
+    token_cache.set(signature, token_data.sub, expires_at=expires_at)
+    return token_data.sub
+
+def _user_from_cache(values: Dict[str, Any], db: Optional[Session]) -> User:
+    """
+    Rebuild a User from cached column values without a query. Each request gets its
+    own instance, attached to its session so it behaves like a loaded row.
+    """
+    user = User(**copy.deepcopy(values))
+    if db is not None:
+        make_transient_to_detached(user)
+        db.add(user)
     return user
 
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached row after the user is updated or deactivated."""
+    user_cache.invalidate(user_id)
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -61,6 +114,13 @@ def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+def get_current_active_superuser(
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=400, detail="The user doesn't have enough privileges")
+    return current_user
+
 def get_mock_user(db: Session = Depends(get_db)) -> User:
     """
     For MVP: Returns a mock user to bypass authentication.
@@ -78,3 +138,21 @@ def get_mock_user(db: Session = Depends(get_db)) -> User:
         equipment_access=["bodyweight", "dumbbells"]
     )
     return mock_user
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T], poll_interval: float = 0.5) -> T:
+    """
+    Await `awaitable`, cancelling it if the HTTP client goes away first.
+    Keeps abandoned requests from holding an LLM concurrency slot.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
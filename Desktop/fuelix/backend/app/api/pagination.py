@@ -0,0 +1,90 @@
+"""
+Keyset (cursor) pagination for per-user history listings, newest first.
+
+Cursors are opaque to clients: a base64url-encoded (timestamp, id) of the last row
+on the page. The next page starts strictly after it, so pages stay stable while new
+rows arrive and every page is an index range scan on (user_id, timestamp).
+
+Legacy rows with a NULL timestamp are listed after all dated rows, newest id first.
+They are read with a separate `timestamp IS NULL` query (still an index range scan)
+and their cursors carry a null timestamp.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return (datetime.fromisoformat(timestamp) if timestamp is not None else None), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def paginate(
+    query: Query,
+    timestamp_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Return one page of `query` ordered by (timestamp, id) descending, and the cursor for
+    the next page (None when this page is the last one).
+    With a cursor the page starts after it; without one, `skip` offsets from the newest
+    row (legacy skip/limit callers). Rows with a NULL timestamp follow the dated ones.
+    A `limit` below 1 returns an empty, final page.
+    """
+    if limit < 1:
+        return [], None
+
+    timestamp, row_id = decode_cursor(cursor) if cursor else (None, None)
+    in_undated = cursor is not None and timestamp is None
+
+    rows = []
+    if not in_undated:
+        dated = query.filter(timestamp_column.is_not(None)).order_by(timestamp_column.desc(), id_column.desc())
+        if cursor:
+            dated = dated.filter(tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id))
+        elif skip:
+            dated = dated.offset(skip)
+        # Fetch one extra row to know whether another page exists
+        rows = dated.limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        # Dated rows ran out: continue into the undated (NULL timestamp) tail
+        undated = query.filter(timestamp_column.is_(None)).order_by(id_column.desc())
+        if in_undated:
+            undated = undated.filter(id_column < row_id)
+        elif skip and not cursor and not rows:
+            # `skip` reached past every dated row; carry the remainder over
+            remaining = skip - query.filter(timestamp_column.is_not(None)).count()
+            if remaining > 0:
+                undated = undated.offset(remaining)
+        rows += undated.limit(limit + 1 - len(rows)).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """List endpoints keep their plain-array bodies and return the cursor as a header."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -1,31 +1,137 @@
-from fastapi import APIRouter
-from app.schemas.ai_trainer import WorkoutGenerationRequest, WorkoutResponse
-from app.ai_engine.workout_generator import WorkoutGenerator
+from datetime import datetime, time
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.ai_trainer import (
+    WorkoutGenerationRequest, WorkoutResponse,
+    BatchWorkoutItem, PlanAthlete, WorkoutBatchRequest, WorkoutBatchResponse
+)
+from app.ai_engine.recovery_logic import ReadinessSnapshot, RecoveryLogic
+from app.ai_engine.workout_generator import WorkoutGenerator, daily_seed
+from app.services.fatigue_state import fatigue_at
+from app.services.batch_generation import generation_pool
+from app.services.bulk_ingest import validate_items
 
 router = APIRouter()
 generator = WorkoutGenerator()
 
+# Fatigue assumed when the caller doesn't supply an athlete state
+DEFAULT_STATE = {
+    "cns_fatigue": 30.0,  # Default moderate fatigue
+    "muscular_upper_fatigue": 25.0,
+    "muscular_lower_fatigue": 25.0,
+    "cardio_fatigue": 20.0
+}
+DEFAULT_EQUIPMENT = ["bodyweight", "dumbbells"]
+
 @router.post("/generate", response_model=WorkoutResponse)
 def generate_workout(request: WorkoutGenerationRequest):
     """
     Generate AI-powered workout without database dependencies.
     """
-    # Create a simple state dict for the workout generator
-    state_dict = {
-        "cns_fatigue": 30.0,  # Default moderate fatigue
-        "muscular_upper_fatigue": 25.0,
-        "muscular_lower_fatigue": 25.0,
-        "cardio_fatigue": 20.0
-    }
-    
     # Generate workout using the correct method name
     workout_data = generator.generate_session(
-        state=state_dict,
-        equipment=request.equipment_available or ["bodyweight", "dumbbells"],
+        state=DEFAULT_STATE,
+        equipment=request.equipment_available or DEFAULT_EQUIPMENT,
         time_available=request.time_available_minutes,
         blocked_movements=[],
         workout_type=request.workout_type,
-        difficulty=request.difficulty
+        difficulty=request.difficulty,
+        seed=request.seed
     )
     
     return WorkoutResponse(**workout_data)
+
+def _validation_error(error) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors)
+
+def _generation_kwargs(item: BatchWorkoutItem, snapshot: Optional[ReadinessSnapshot]) -> Dict[str, Any]:
+    seed = item.seed
+    if seed is None and item.athlete_id is not None and item.day is not None:
+        seed = daily_seed(item.athlete_id, item.day)
+
+    state, blocked = item.state, list(item.blocked_movements)
+    if snapshot is not None:
+        if state is None and snapshot.state is not None:
+            # Stored fatigue decayed to the start of the planned day (or now)
+            when = datetime.combine(item.day, time.min) if item.day else None
+            state = fatigue_at(snapshot.state, when)
+        blocked = sorted(set(blocked) | set(RecoveryLogic.blocked_for_injuries(snapshot.active_injuries)))
+    return {
+        "state": state or DEFAULT_STATE,
+        "equipment": item.equipment_available or DEFAULT_EQUIPMENT,
+        "time_available": item.time_available_minutes,
+        "blocked_movements": blocked,
+        "workout_type": item.workout_type,
+        "difficulty": item.difficulty,
+        "seed": seed
+    }
+
+@router.post("/generate/batch", response_model=WorkoutBatchResponse)
+def generate_workout_batch(
+    request: WorkoutBatchRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Generate many workouts in one call (e.g. a team's week), fanned out over worker processes.
+    `items` are generated as given; `plan` adds one workout per athlete per day.
+    Entries with an athlete_id use that athlete's stored fatigue and active injuries
+    (other athletes than yourself need a superuser / coach account).
+    Results keep request order; a failing item carries an error instead of failing the batch.
+    """
+    plan_size = len(request.plan.athletes) * len(request.plan.days) if request.plan else 0
+    if len(request.items) + plan_size > settings.BATCH_GENERATION_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BATCH_GENERATION_MAX_ITEMS} workouts per batch"
+        )
+
+    # (item, error) per result slot; invalid entries get an error result in place
+    entries: List[Tuple[Optional[BatchWorkoutItem], Optional[str]]] = [(None, None)] * len(request.items)
+    valid, invalid = validate_items(request.items, BatchWorkoutItem)
+    for index, item in valid:
+        entries[index] = (item, None)
+    for error in invalid:
+        entries[error.index] = (None, _validation_error(error))
+
+    if request.plan:
+        athletes = [(None, None)] * len(request.plan.athletes)
+        valid, invalid = validate_items(request.plan.athletes, PlanAthlete)
+        for index, athlete in valid:
+            athletes[index] = (athlete, None)
+        for error in invalid:
+            athletes[error.index] = (None, f"plan.athletes[{error.index}]: {_validation_error(error)}")
+        for athlete, error in athletes:
+            for day in request.plan.days:
+                entries.append((athlete.model_copy(update={"day": day}), None) if athlete else (None, error))
+
+    # Athletes' stored state and injuries, loaded once for the whole batch
+    athlete_ids = {item.athlete_id for item, _ in entries if item is not None and item.athlete_id is not None}
+    allowed = athlete_ids if current_user.is_superuser else athlete_ids & {current_user.id}
+    snapshots = ReadinessSnapshot.load_many(allowed, db)
+    for index, (item, _) in enumerate(entries):
+        if item is not None and item.athlete_id is not None and item.athlete_id not in allowed:
+            entries[index] = (item, f"Not allowed to plan workouts for athlete {item.athlete_id}")
+
+    to_generate = [
+        _generation_kwargs(item, snapshots.get(item.athlete_id))
+        for item, error in entries if item is not None and error is None
+    ]
+    generated = iter(generation_pool.generate(to_generate))
+    results = []
+    for index, (item, error) in enumerate(entries):
+        workout = None
+        if item is not None and error is None:
+            workout, error = next(generated)
+        results.append({
+            "index": index,
+            "athlete_id": item.athlete_id if item else None,
+            "day": item.day if item else None,
+            "workout": workout,
+            "error": error
+        })
+    return WorkoutBatchResponse(results=results)
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.api import deps
@@ -12,7 +13,7 @@ from app.schemas.token import Token
 router = APIRouter()
 
 @router.post("/login/access-token", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
@@ -25,11 +26,22 @@ def login_access_token(
         )
     
     try:
-        user = db.query(User).filter(User.email == form_data.username).first()
-        if not user or not security.verify_password(form_data.password, user.hashed_password):
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == form_data.username).first()
+        )
+        if not user:
+            raise HTTPException(status_code=400, detail="Incorrect email or password")
+        # bcrypt runs on the dedicated password pool, not the request threadpool
+        verified, new_hash = await security.verify_and_update_password_async(
+            form_data.password, user.hashed_password
+        )
+        if not verified:
             raise HTTPException(status_code=400, detail="Incorrect email or password")
         if not user.is_active:
             raise HTTPException(status_code=400, detail="Inactive user")
+        if new_hash:
+            # Stored hash used an outdated cost factor; upgrade it transparently
+            await run_in_threadpool(_save_password_hash, db, user, new_hash)
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         return {
@@ -40,9 +52,18 @@ def login_access_token(
         }
     except HTTPException:
         raise
+    except security.PasswordPoolFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Login service is busy. Please try again shortly."
+        )
     except Exception as e:
         print(f"Login error: {e}")
         raise HTTPException(
             status_code=500,
             detail="An error occurred during login. Please try again."
         )
+
+def _save_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    user.hashed_password = hashed_password
+    db.commit()
@@ -1,19 +1,39 @@
-from fastapi import APIRouter, Depends
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.api import deps
+from app.api.pagination import paginate
 from app.schemas.coach import CoachResponse
 from app.ai_engine.coach_orchestrator import CoachOrchestrator
-from app.ai_engine.llm_service import LLMService
 from app.models.user import User
 from app.models.chat_message import ChatMessage
 from datetime import datetime
+from typing import Optional
 
 router = APIRouter()
 orchestrator = CoachOrchestrator()
-llm = LLMService()
+
+def _save_chat_message(db: Session, user_id: int, message: str, response_text: str) -> Optional[int]:
+    try:
+        chat_record = ChatMessage(
+            user_id=user_id,
+            user_message=message,
+            ai_response=response_text,
+            timestamp=datetime.utcnow()
+        )
+        db.add(chat_record)
+        db.commit()
+        return chat_record.id
+    except Exception as e:
+        print(f"Failed to save chat message: {e}")
+        # Continue even if save fails
+        return None
 
 @router.post("/chat", response_model=CoachResponse)
-def chat_with_coach(
+async def chat_with_coach(
+    request: Request,
     message: str,
     user: User = Depends(deps.get_current_active_user),
     db: Session = Depends(deps.get_db)
@@ -23,22 +43,13 @@ def chat_with_coach(
     Uses CoachOrchestrator for context-aware responses.
     """
     # Generate AI response using orchestrator for better context
-    response_text = orchestrator.process_message(user, message, db)
+    response_text = await deps.cancel_on_disconnect(
+        request, orchestrator.process_message_async(user, message, db)
+    )
     
     # Save to database if available
     if db is not None:
-        try:
-            chat_record = ChatMessage(
-                user_id=user.id,
-                user_message=message,
-                ai_response=response_text,
-                timestamp=datetime.utcnow()
-            )
-            db.add(chat_record)
-            db.commit()
-        except Exception as e:
-            print(f"Failed to save chat message: {e}")
-            # Continue even if save fails
+        await run_in_threadpool(_save_chat_message, db, user.id, message, response_text)
     
     return CoachResponse(
         recommendation=response_text,
@@ -46,22 +57,63 @@ def chat_with_coach(
         adjusted_plan=None
     )
 
+@router.post("/chat/stream")
+async def stream_chat_with_coach(
+    message: str,
+    user: User = Depends(deps.get_current_active_user),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Chat with the AI Coach, streaming the response as Server-Sent Events.
+    Emits `{"token": ...}` events as text arrives, then a `done` event once the
+    conversation is saved. If generation fails part-way, an `error` event replaces `done`
+    and the partial reply is not saved; the client should discard it and retry.
+    Disconnecting mid-stream cancels generation and nothing is saved.
+    """
+    async def event_stream():
+        parts = []
+        try:
+            async for chunk in orchestrator.stream_message(user, message, db):
+                parts.append(chunk)
+                yield f"data: {json.dumps({'token': chunk})}\n\n"
+        except Exception as e:
+            print(f"Coach stream failed: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': 'The coach response was interrupted. Please try again.'})}\n\n"
+            return
+        
+        message_id = None
+        if db is not None:
+            message_id = await run_in_threadpool(_save_chat_message, db, user.id, message, "".join(parts))
+        yield f"event: done\ndata: {json.dumps({'id': message_id})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/history")
-def get_chat_history(
+async def get_chat_history(
     limit: int = 20,
+    cursor: Optional[str] = None,
     user: User = Depends(deps.get_current_active_user),
     db: Session = Depends(deps.get_db)
 ):
     """
-    Get user's chat history with the AI Coach.
+    Get user's chat history with the AI Coach, newest first.
+    Pass `next_cursor` back as `cursor` for older messages.
     """
     if db is None:
         return {"messages": [], "message": "Database unavailable"}
     
     try:
-        messages = db.query(ChatMessage).filter(
-            ChatMessage.user_id == user.id
-        ).order_by(ChatMessage.timestamp.desc()).limit(limit).all()
+        messages, next_cursor = await run_in_threadpool(
+            lambda: paginate(
+                db.query(ChatMessage).filter(ChatMessage.user_id == user.id),
+                ChatMessage.timestamp, ChatMessage.id,
+                limit=limit, cursor=cursor
+            )
+        )
         
         return {
             "messages": [
@@ -72,8 +124,11 @@ def get_chat_history(
                     "timestamp": msg.timestamp.isoformat()
                 }
                 for msg in messages
-            ]
+            ],
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Failed to retrieve chat history: {e}")
         return {"messages": [], "error": str(e)}
@@ -3,14 +3,23 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import date
 from app.api import deps
+from app.db.upsert import upsert_returning
 from app.models.user import User
 from app.models.daily_log import DailyLog
 from app.schemas.daily_log import DailyLog as DailyLogSchema, DailyLogUpdate
 from app.ai_engine.ai_analyzer import AIAnalyzer
+from app.ai_engine.context_manager import ContextManager
 
 router = APIRouter()
 analyzer = AIAnalyzer()
 
+DEFAULT_LOG_VALUES = {
+    "total_calories_in": 0,
+    "total_training_minutes": 0,
+    "recovery_score": 0,
+    "sleep_hours": 0.0
+}
+
 @router.get("/today", response_model=DailyLogSchema)
 def get_today_metrics(
     *,
@@ -22,28 +31,15 @@ def get_today_metrics(
     Creates a new daily log if one doesn't exist for today.
     """
     today = date.today()
-    
-    # Try to get existing log for today
-    daily_log = db.query(DailyLog).filter(
-        DailyLog.user_id == current_user.id,
-        DailyLog.date == today
-    ).first()
-    
-    # Create if doesn't exist
-    if not daily_log:
-        daily_log = DailyLog(
-            user_id=current_user.id,
-            date=today,
-            total_calories_in=0,
-            total_training_minutes=0,
-            recovery_score=0,
-            sleep_hours=0.0
-        )
-        db.add(daily_log)
-        db.commit()
-        db.refresh(daily_log)
-    
-    return daily_log
+    daily_log = upsert_returning(
+        db, DailyLog,
+        key={"user_id": current_user.id, "date": today},
+        insert_values=DEFAULT_LOG_VALUES
+    )
+    # Serialize before commit so the expired instance isn't reloaded with a second query
+    response = DailyLogSchema.model_validate(daily_log)
+    db.commit()
+    return response
 
 @router.put("/today", response_model=DailyLogSchema)
 def update_today_metrics(
@@ -57,30 +53,22 @@ def update_today_metrics(
     Auto-creates daily log if it doesn't exist.
     """
     today = date.today()
-    
-    # Get or create today's log
-    daily_log = db.query(DailyLog).filter(
-        DailyLog.user_id == current_user.id,
-        DailyLog.date == today
-    ).first()
-    
-    if not daily_log:
-        daily_log = DailyLog(
-            user_id=current_user.id,
-            date=today
-        )
-        db.add(daily_log)
-    
-    # Update fields
-    update_data = metrics_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        if value is not None:  # Only update non-None values
-            setattr(daily_log, field, value)
-    
+    update_data = {
+        field: value
+        for field, value in metrics_update.model_dump(exclude_unset=True).items()
+        if value is not None and field != "date"  # Only update non-None values; the log stays on today
+    }
+    daily_log = upsert_returning(
+        db, DailyLog,
+        key={"user_id": current_user.id, "date": today},
+        insert_values=DEFAULT_LOG_VALUES,
+        update_values=update_data
+    )
+    response = DailyLogSchema.model_validate(daily_log)
     db.commit()
-    db.refresh(daily_log)
-    
-    return daily_log
+    # Core-level upserts skip the ORM flush events that normally expire coach context
+    ContextManager.invalidate(current_user.id)
+    return response
 
 @router.get("/today/insights")
 def get_today_insights(
@@ -1,9 +1,13 @@
-from typing import Any
+import zlib
+from datetime import datetime
+from typing import Any, Iterator
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.schemas.finetuning import ConversationRating, DatasetExportRequest, DatasetStatistics
-from app.ai_engine.finetuning_service import FineTuningService
+from app.ai_engine.finetuning_service import EXPORT_FORMATS, FineTuningService
+from app.models.user import User
 
 router = APIRouter()
 finetuning_service = FineTuningService()
@@ -40,16 +44,60 @@ def export_training_dataset(
             db=db,
             min_rating=request.min_rating,
             format=request.format,
-            dataset_version=request.dataset_version
+            dataset_version=request.dataset_version,
+            compress=request.compress
         )
         return {
             "status": "success",
             "filename": filename,
             "message": f"Training dataset exported successfully"
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/export-dataset/download")
+def download_training_dataset(
+    request: DatasetExportRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser)
+) -> StreamingResponse:
+    """
+    Stream the training dataset as a file download instead of writing it on the server.
+    Conversations are marked as included only if the download completes.
+    """
+    if request.format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Supported formats: {', '.join(EXPORT_FORMATS)}")
+    
+    format = request.format
+    dataset_version = request.dataset_version or datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"training_data_{dataset_version}.{format}"
+    chunks = (
+        chunk.encode("utf-8")
+        for chunk in finetuning_service.iter_export(db, request.min_rating, format, dataset_version)
+    )
+    if request.compress:
+        filename += ".gz"
+        chunks = _gzip_stream(chunks)
+    
+    media_type = "application/gzip" if request.compress else (
+        "application/json" if format == "json" else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
 @router.get("/dataset-stats", response_model=DatasetStatistics)
 def get_dataset_statistics(
     db: Session = Depends(deps.get_db)
@@ -1,10 +1,16 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.pagination import paginate, set_next_cursor
 from app.models.user import User
-from app.models.nutrition import NutritionLog, WaterLog
+from app.models.nutrition import NutritionLog, NutritionDailyRollup, WaterLog
+from app.schemas.bulk import BulkIngestResult
 from app.schemas.nutrition import NutritionLogCreate, NutritionLog as NutritionSchema, WaterLogCreate, WaterLog as WaterSchema
+from app.services.bulk_ingest import insert_rows, validate_items
+from app.services.nutrition_rollup import TOTAL_COLUMNS, add_to_rollup
 
 router = APIRouter()
 
@@ -22,24 +28,73 @@ def log_meal(
         **meal_in.model_dump(),
         user_id=current_user.id
     )
+    # Resolve the timestamp now so the meal and its daily rollup agree on the day
+    db_obj.timestamp = db_obj.timestamp or datetime.utcnow()
     db.add(db_obj)
+    add_to_rollup(
+        db, current_user.id, db_obj.timestamp.date(),
+        db_obj.calories, db_obj.protein_g, db_obj.carbs_g, db_obj.fats_g
+    )
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+@router.post("/meals/bulk", response_model=BulkIngestResult)
+def log_meals_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    meals_in: List[Dict[str, Any]] = Body(...),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Log many meals in one transaction (offline sync, wearables).
+    Invalid entries are reported by array index; the rest are still saved.
+    """
+    valid, errors = validate_items(meals_in, NutritionLogCreate)
+    now = datetime.utcnow()
+    rows = []
+    day_totals = defaultdict(lambda: dict.fromkeys(TOTAL_COLUMNS, 0))
+    for index, meal in valid:
+        row = {**meal.model_dump(), "user_id": current_user.id, "timestamp": meal.timestamp or now}
+        rows.append((index, row))
+        totals = day_totals[row["timestamp"].date()]
+        totals["total_calories"] += row["calories"]
+        totals["total_protein"] += row["protein_g"] or 0.0
+        totals["total_carbs"] += row["carbs_g"] or 0.0
+        totals["total_fats"] += row["fats_g"] or 0.0
+        totals["meal_count"] += 1
+
+    created = insert_rows(db, NutritionLog, rows)
+    # One rollup upsert per distinct day rather than per meal
+    for day, totals in day_totals.items():
+        add_to_rollup(
+            db, current_user.id, day,
+            totals["total_calories"], totals["total_protein"], totals["total_carbs"], totals["total_fats"],
+            meal_count=totals["meal_count"]
+        )
+    db.commit()
+    return BulkIngestResult(created=created, errors=errors)
+
 @router.get("/meals", response_model=List[NutritionSchema])
 def read_meals(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Get meal logs.
+    Get meal logs, newest first.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    return db.query(NutritionLog).filter(
-        NutritionLog.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    meals, next_cursor = paginate(
+        db.query(NutritionLog).filter(NutritionLog.user_id == current_user.id),
+        NutritionLog.timestamp, NutritionLog.id,
+        limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
+    return meals
 
 @router.post("/water", response_model=WaterSchema)
 def log_water(
@@ -60,6 +115,27 @@ def log_water(
     db.refresh(db_obj)
     return db_obj
 
+@router.post("/water/bulk", response_model=BulkIngestResult)
+def log_water_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    water_in: List[Dict[str, Any]] = Body(...),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Log many water entries in one transaction.
+    Invalid entries are reported by array index; the rest are still saved.
+    """
+    valid, errors = validate_items(water_in, WaterLogCreate)
+    now = datetime.utcnow()
+    rows = [
+        (index, {**water.model_dump(), "user_id": current_user.id, "timestamp": water.timestamp or now})
+        for index, water in valid
+    ]
+    created = insert_rows(db, WaterLog, rows)
+    db.commit()
+    return BulkIngestResult(created=created, errors=errors)
+
 @router.get("/monthly-stats")
 def get_monthly_nutrition_stats(
     *,
@@ -70,42 +146,34 @@ def get_monthly_nutrition_stats(
 ) -> Any:
     """
     Get monthly nutrition statistics aggregated by day.
+    Reads the daily rollups (at most 31 rows) instead of every meal of the month.
     """
-    from datetime import datetime
+    from datetime import date
     from calendar import monthrange
-    from sqlalchemy import func
     
     # Get first and last day of month
     _, last_day = monthrange(year, month)
-    start_date = datetime(year, month, 1)
-    end_date = datetime(year, month, last_day, 23, 59, 59)
+    start_date = date(year, month, 1)
+    end_date = date(year, month, last_day)
     
-    # Get all nutrition logs for the month
-    logs = db.query(NutritionLog).filter(
-        NutritionLog.user_id == current_user.id,
-        NutritionLog.timestamp >= start_date,
-        NutritionLog.timestamp <= end_date
-    ).all()
+    rollups = db.query(NutritionDailyRollup).filter(
+        NutritionDailyRollup.user_id == current_user.id,
+        NutritionDailyRollup.date >= start_date,
+        NutritionDailyRollup.date <= end_date,
+        NutritionDailyRollup.meal_count > 0
+    ).order_by(NutritionDailyRollup.date).all()
     
-    # Aggregate by day
-    daily_stats = {}
-    for log in logs:
-        day_key = log.timestamp.date().isoformat()
-        if day_key not in daily_stats:
-            daily_stats[day_key] = {
-                "date": day_key,
-                "total_calories": 0,
-                "total_protein": 0,
-                "total_carbs": 0,
-                "total_fats": 0,
-                "meal_count": 0
-            }
-        
-        daily_stats[day_key]["total_calories"] += log.calories
-        daily_stats[day_key]["total_protein"] += log.protein_g
-        daily_stats[day_key]["total_carbs"] += log.carbs_g
-        daily_stats[day_key]["total_fats"] += log.fats_g
-        daily_stats[day_key]["meal_count"] += 1
+    daily_stats = {
+        r.date.isoformat(): {
+            "date": r.date.isoformat(),
+            "total_calories": r.total_calories,
+            "total_protein": r.total_protein,
+            "total_carbs": r.total_carbs,
+            "total_fats": r.total_fats,
+            "meal_count": r.meal_count
+        }
+        for r in rollups
+    }
     
     # Calculate monthly averages
     days_with_data = len(daily_stats)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional
 
 from app.api import deps
 from app.models.user import User
+from app.core.config import settings
+from app.models.athlete_state import AthleteState
 from app.models.injury import Injury, InjuryStatus
-from app.schemas.recovery import InjuryCreate, InjuryUpdate, InjuryResponse, RecoveryStatusResponse
+from app.ai_engine.fatigue_model import FatigueModel
+from app.schemas.recovery import (
+    InjuryCreate, InjuryUpdate, InjuryResponse, RecoveryStatusResponse,
+    FatigueForecastRequest, FatigueForecastResponse
+)
 from app.ai_engine.recovery_logic import RecoveryLogic
+from app.services.fatigue_state import fatigue_curve, readiness_curve, session_event, state_as_of
 
 router = APIRouter()
 recovery_logic = RecoveryLogic()
@@ -22,6 +30,62 @@ def get_recovery_status(
     status_data = recovery_logic.calculate_readiness(current_user, db)
     return status_data
 
+def _fatigue_forecast(db: Session, user: User, request: FatigueForecastRequest) -> Dict[str, Any]:
+    if request.at:
+        count = len(request.at)
+    else:
+        if request.step_hours <= 0 or request.horizon_hours < 0:
+            raise HTTPException(status_code=400, detail="horizon_hours must be >= 0 and step_hours > 0")
+        count = int(request.horizon_hours // request.step_hours) + 1
+    if count > settings.FATIGUE_FORECAST_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.FATIGUE_FORECAST_MAX_POINTS} time points per request"
+        )
+    if request.at:
+        times = request.at
+    else:
+        now = datetime.utcnow()
+        times = [now + timedelta(hours=i * request.step_hours) for i in range(count)]
+
+    state = db.query(AthleteState).filter(AthleteState.user_id == user.id).first()
+    curve = fatigue_curve(state, times, [session_event(**s.model_dump()) for s in request.scheduled])
+    scores = readiness_curve(curve)
+    keys = [f"{system}_fatigue" for system in FatigueModel.SYSTEMS]
+    return {
+        "as_of": state_as_of(state) if state else None,
+        "points": [
+            {"at": at, "readiness": score, **dict(zip(keys, row))}
+            for at, row, score in zip(times, curve.tolist(), scores.tolist())
+        ]
+    }
+
+@router.get("/fatigue", response_model=FatigueForecastResponse)
+def get_fatigue_forecast(
+    at: Optional[List[datetime]] = Query(None),
+    horizon_hours: float = 72,
+    step_hours: float = 1,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Fatigue per system and readiness at the given `at` timestamps, or sampled every
+    `step_hours` over the next `horizon_hours` (default: 72h hourly).
+    """
+    request = FatigueForecastRequest(at=at, horizon_hours=horizon_hours, step_hours=step_hours)
+    return _fatigue_forecast(db, current_user, request)
+
+@router.post("/fatigue/forecast", response_model=FatigueForecastResponse)
+def forecast_fatigue(
+    request: FatigueForecastRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Same as GET /fatigue, with planned sessions (`scheduled`) folded into the curve.
+    """
+    return _fatigue_forecast(db, current_user, request)
+
 @router.post("/injuries", response_model=InjuryResponse)
 def log_injury(
     injury_in: InjuryCreate,
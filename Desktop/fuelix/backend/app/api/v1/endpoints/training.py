@@ -1,10 +1,16 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.pagination import paginate, set_next_cursor
+from app.ai_engine.context_manager import ContextManager
 from app.models.user import User
 from app.models.training import TrainingSession
+from app.schemas.bulk import BulkIngestResult
 from app.schemas.training import TrainingSessionCreate, TrainingSession as TrainingSessionSchema
+from app.services.bulk_ingest import insert_rows, validate_items
+from app.services.fatigue_state import ingest_sessions, session_event
 
 router = APIRouter()
 
@@ -16,28 +22,62 @@ def create_training_session(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Log a new training session.
+    Log a new training session and fold it into the athlete's fatigue state.
     """
+    session_data = {**session_in.model_dump(), "started_at": session_in.started_at or datetime.utcnow()}
     db_obj = TrainingSession(
-        **session_in.model_dump(),
+        **session_data,
         user_id=current_user.id
     )
     db.add(db_obj)
+    ingest_sessions(db, current_user.id, [session_event(**session_data)])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+@router.post("/bulk", response_model=BulkIngestResult)
+def create_training_sessions_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    sessions_in: List[Dict[str, Any]] = Body(...),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Log many training sessions in one transaction.
+    Invalid entries are reported by array index; the rest are still saved.
+    """
+    valid, errors = validate_items(sessions_in, TrainingSessionCreate)
+    now = datetime.utcnow()
+    rows = [
+        (index, {**session.model_dump(), "user_id": current_user.id, "started_at": session.started_at or now})
+        for index, session in valid
+    ]
+    created = insert_rows(db, TrainingSession, rows)
+    if created:
+        ingest_sessions(db, current_user.id, [session_event(**row) for _, row in rows])
+    db.commit()
+    if created:
+        # Core inserts skip the ORM flush events that normally expire coach context
+        ContextManager.invalidate(current_user.id)
+    return BulkIngestResult(created=created, errors=errors)
+
 @router.get("/", response_model=List[TrainingSessionSchema])
 def read_training_sessions(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve training sessions.
+    Retrieve training sessions, newest first.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    sessions = db.query(TrainingSession).filter(
-        TrainingSession.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    sessions, next_cursor = paginate(
+        db.query(TrainingSession).filter(TrainingSession.user_id == current_user.id),
+        TrainingSession.started_at, TrainingSession.id,
+        limit=limit, cursor=cursor, skip=skip
+    )
+    set_next_cursor(response, next_cursor)
     return sessions
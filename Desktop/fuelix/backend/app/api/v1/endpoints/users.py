@@ -1,5 +1,6 @@
 from typing import Any, List
 from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from app.api import deps
@@ -11,7 +12,7 @@ from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
 router = APIRouter()
 
 @router.post("/", response_model=UserSchema)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserCreate,
@@ -22,14 +23,22 @@ def create_user(
     if db is None:
         raise HTTPException(status_code=503, detail="Database unavailable")
         
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user_in.email).first()
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
     
-    hashed_password = security.get_password_hash(user_in.password)
+    try:
+        hashed_password = await security.get_password_hash_async(user_in.password)
+    except security.PasswordPoolFull:
+        raise HTTPException(status_code=503, detail="Signup service is busy. Please try again shortly.")
+    return await run_in_threadpool(_insert_user, db, user_in, hashed_password)
+
+def _insert_user(db: Session, user_in: UserCreate, hashed_password: str) -> User:
     db_obj = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -83,4 +92,23 @@ def update_user_me(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    deps.invalidate_user(current_user.id)
     return current_user
+
+@router.put("/{user_id}/deactivate")
+def deactivate_user(
+    user_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Deactivate a user account (superusers only).
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user.is_active = False
+    db.commit()
+    deps.invalidate_user(user_id)
+    return {"status": "success", "user_id": user_id, "is_active": False}
@@ -1,4 +1,4 @@
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic import AnyHttpUrl, validator
 from pydantic_settings import BaseSettings
 
@@ -13,6 +13,16 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-super-secret-key-change-me-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # Authenticated-user caches (see app.api.deps)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Changing this rehashes passwords transparently on next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 256  # Pending hash jobs before logins get 503
+
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
@@ -29,6 +39,57 @@ class Settings(BaseSettings):
     # Use SQLite for demo/development
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./fuelix.db"
 
+    # Connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this (seconds)
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 0  # Connections to open at startup
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres statement_timeout, 0 = none
+
+    # SQLite performance mode: WAL + pragmas, writes serialized in-process (see app.db.sqlite)
+    SQLITE_PERFORMANCE_MODE: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+
+    # Bulk ingestion (offline sync / wearables)
+    BULK_INGEST_MAX_ITEMS: int = 1000
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 60 * 60  # 1 hour
+    LLM_CACHE_DB_PATH: Optional[str] = None  # e.g. "./llm_cache.db" to persist across restarts
+
+    # Async LLM client
+    LLM_BACKEND: str = "auto"  # auto (Gemini if GEMINI_API_KEY is set), gemini, stub
+    LLM_MAX_CONCURRENCY: int = 8  # Max in-flight LLM requests per process
+    LLM_TIMEOUT_SECONDS: float = 30.0
+    LLM_STUB_LATENCY_MS: int = 0  # Artificial latency for the stub backend (benchmarks)
+
+    # Per-user coach context snapshots. Invalidation is per process, so keep the TTL
+    # short when running several workers.
+    CONTEXT_CACHE_ENABLED: bool = False
+    CONTEXT_CACHE_TTL_SECONDS: int = 300
+
+    # Seeded workout sessions cache (app.ai_engine.workout_generator)
+    WORKOUT_CACHE_SIZE: int = 4096
+    WORKOUT_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Batch workout generation (app.services.batch_generation)
+    BATCH_GENERATION_WORKERS: int = 0  # Worker processes; 0 = one per CPU
+    # Items cost ~55-75us inline; a pool round trip ~2ms plus ~15us/item of pickling,
+    # so below ~128 items (~8ms of work) the pool loses even with idle cores
+    BATCH_GENERATION_MIN_PARALLEL: int = 128  # Smaller batches are generated inline
+    BATCH_GENERATION_MIN_CHUNK: int = 32  # Items per worker task (~2ms of work)
+    BATCH_GENERATION_MAX_ITEMS: int = 2000
+
+    # Fatigue
+    FATIGUE_DECAY_MODEL: str = "linear"  # linear, exponential
+    FATIGUE_FORECAST_MAX_POINTS: int = 2000  # Time points per fatigue forecast request
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,10 +1,14 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with a different cost factor are flagged by needs_update()/verify_and_update()
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 ALGORITHM = "HS256"
 
@@ -25,3 +29,67 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify, and return a replacement hash if the stored one uses an outdated cost factor."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordPoolFull(Exception):
+    """Raised when too many password hashes are already waiting for a worker."""
+    pass
+
+
+class PasswordHasherPool:
+    """
+    Dedicated, size-bounded pool for bcrypt work, so slow hashing never occupies
+    the FastAPI threadpool. bcrypt releases the GIL, so threads hash in parallel.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0  # submitted, not yet finished (queued + running)
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolFull("Password hashing queue is full")
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "queue_depth": max(0, self.pending - self.max_workers),
+            "in_flight": min(self.pending, self.max_workers),
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_queue": self.max_queue
+        }
+
+
+password_pool = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_pool.run(verify_and_update_password, plain_password, hashed_password)
@@ -1,10 +1,139 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
 
-# Create engine - SQLite doesn't need connection pooling config
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.SQLALCHEMY_DATABASE_URI else {}
-)
+is_sqlite = settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite")
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited (free slot or new connection)."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def _engine_options() -> Dict[str, Any]:
+    """Pool configuration from settings. SQLite keeps SQLAlchemy's defaults."""
+    if is_sqlite:
+        return {"connect_args": {"check_same_thread": False}}
+
+    options: Dict[str, Any] = {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and settings.SQLALCHEMY_DATABASE_URI.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **_engine_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if is_sqlite and settings.SQLITE_PERFORMANCE_MODE:
+    from app.db.sqlite import enable_performance_mode
+    enable_performance_mode(engine, SessionLocal)
+
+
+class PoolMetrics:
+    """
+    Connection pool counters fed by pool events, reported on /metrics.
+    On Postgres, checkout wait is the time spent getting a connection from the pool;
+    a rising max wait is the sign of an exhausted pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.invalidated = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidated += 1
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        pool = engine.pool
+        stats = {
+            "pool_class": type(pool).__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "invalidated": self.invalidated,
+        }
+        if isinstance(pool, TimedQueuePool):
+            stats.update({
+                "size": pool.size(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "avg_checkout_wait_ms": round(1000 * self.total_wait / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_checkout_wait_ms": round(1000 * self.max_wait, 3),
+            })
+        return stats
+
+
+pool_metrics = PoolMetrics()
+event.listen(engine, "connect", pool_metrics.on_connect)
+event.listen(engine, "checkout", pool_metrics.on_checkout)
+event.listen(engine, "checkin", pool_metrics.on_checkin)
+event.listen(engine, "invalidate", pool_metrics.on_invalidate)
+
+
+def warm_up_pool(connections: int) -> int:
+    """
+    Open `connections` connections up front (capped at the pool size) so the first
+    requests after a deploy don't pay for connection setup. Returns how many opened.
+    """
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conn.execute(text("SELECT 1"))
+            opened.append(conn)
+    except Exception as e:
+        print(f"Pool warm-up stopped after {len(opened)} connections: {e}")
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
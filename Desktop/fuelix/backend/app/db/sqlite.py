@@ -0,0 +1,109 @@
+"""
+SQLite performance mode: WAL journaling, tuned pragmas and a single in-process writer.
+
+WAL lets readers run alongside a writer, but SQLite still allows only one writer at a
+time. Instead of letting concurrent sessions race for the file lock (and fail with
+"database is locked" once busy_timeout runs out), sessions queue for WriteSerializer
+on their first write and hold it until their transaction ends. Reads never take it.
+A session that can't get the lock within busy_timeout fails with WriteQueueTimeout
+(served as 503) instead of racing the current writer.
+"""
+import threading
+import time
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core.config import settings
+
+
+def _set_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Durable across app crashes; fsync only at checkpoints
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")  # Negative = KiB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+class WriteQueueTimeout(Exception):
+    """Raised when a session waited longer than busy_timeout for the SQLite write lock."""
+    pass
+
+
+class WriteSerializer:
+    """
+    Process-wide write lock for SQLite sessions, taken on a session's first write
+    and released when that session's transaction commits, rolls back or closes.
+    """
+
+    INFO_KEY = "sqlite_write_lock"
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout_seconds = timeout_seconds
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, session: Session) -> None:
+        if session.info.get(self.INFO_KEY):
+            return
+        with self._stats_lock:
+            self.waiting += 1
+        start = time.perf_counter()
+        got_lock = self._lock.acquire(timeout=self.timeout_seconds)
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self.waiting -= 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            if got_lock:
+                self.acquired += 1
+            else:
+                self.timeouts += 1
+        if not got_lock:
+            raise WriteQueueTimeout(f"No SQLite write lock after {self.timeout_seconds}s")
+        session.info[self.INFO_KEY] = True
+
+    def release(self, session: Session) -> None:
+        if session.info.pop(self.INFO_KEY, False):
+            self._lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "waiting": self.waiting,
+            "locked": self._lock.locked(),
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(1000 * self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 3),
+        }
+
+
+write_serializer = WriteSerializer(timeout_seconds=settings.SQLITE_BUSY_TIMEOUT_MS / 1000.0)
+
+
+def enable_performance_mode(engine: Engine, session_factory: sessionmaker) -> None:
+    """Install the pragmas on every new connection and serialize writes from `session_factory` sessions."""
+    event.listen(engine, "connect", _set_pragmas)
+
+    @event.listens_for(session_factory, "before_flush")
+    def _lock_before_flush(session, flush_context, instances):
+        write_serializer.acquire(session)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _lock_before_dml(orm_execute_state):
+        # Bulk insert/update/delete statements bypass flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            write_serializer.acquire(orm_execute_state.session)
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def _unlock_after_transaction(session, transaction):
+        if transaction.parent is None:
+            write_serializer.release(session)
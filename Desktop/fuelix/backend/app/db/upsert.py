@@ -0,0 +1,60 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+ModelType = TypeVar("ModelType")
+
+
+def dialect_insert(db: Session):
+    """
+    Return the dialect's insert() construct supporting ON CONFLICT (SQLite, Postgres),
+    or None when the backend has no native upsert and callers must fall back.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def upsert_returning(
+    db: Session,
+    model: Type[ModelType],
+    key: Dict[str, Any],
+    insert_values: Optional[Dict[str, Any]] = None,
+    update_values: Optional[Dict[str, Any]] = None
+) -> ModelType:
+    """
+    Get-or-create the row identified by `key` (the columns of a unique constraint) and
+    apply `update_values` to it, as one INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+    `insert_values` only apply when the row is created. Returns the ORM object;
+    runs inside the caller's transaction, the caller commits.
+    """
+    update_values = update_values or {}
+    row = {**key, **(insert_values or {}), **update_values}
+
+    insert = dialect_insert(db)
+    if insert is not None and db.get_bind().dialect.insert_returning:
+        stmt = insert(model).values(**row)
+        # With nothing to update, re-assign a key column so RETURNING still yields the existing row
+        set_ = update_values or {column: getattr(stmt.excluded, column) for column in key}
+        stmt = stmt.on_conflict_do_update(index_elements=list(key), set_=set_).returning(model)
+        return db.execute(stmt, execution_options={"populate_existing": True}).scalar_one()
+
+    obj = db.query(model).filter_by(**key).first()
+    if obj is None:
+        try:
+            with db.begin_nested():
+                obj = model(**row)
+                db.add(obj)
+            return obj
+        except IntegrityError:
+            # Created concurrently; update the winner's row instead
+            obj = db.query(model).filter_by(**key).one()
+    for field, value in update_values.items():
+        setattr(obj, field, value)
+    db.flush()
+    return obj
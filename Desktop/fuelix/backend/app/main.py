@@ -1,8 +1,17 @@
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api import deps
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core import security
+from app.ai_engine.workout_generator import session_cache as workout_cache
+from app.db.session import is_sqlite, pool_metrics, warm_up_pool
+from app.db.sqlite import WriteQueueTimeout
+from app.models.user import User
+from app.services.batch_generation import generation_pool
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -17,13 +26,49 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.exception_handler(WriteQueueTimeout)
+def write_queue_timeout(request: Request, exc: WriteQueueTimeout):
+    # Too many writers queued on SQLite: ask the client to retry rather than writing unlocked
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy. Please try again shortly."},
+        headers={"Retry-After": "1"}
+    )
+
+@app.on_event("startup")
+def warm_up_database_pool():
+    if settings.DB_POOL_WARMUP:
+        opened = warm_up_pool(settings.DB_POOL_WARMUP)
+        print(f"Database pool warmed up with {opened} connections")
+
+@app.on_event("shutdown")
+def stop_generation_pool():
+    generation_pool.shutdown()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Leak Fitness API"}
 
+@app.get("/metrics")
+def metrics(current_user: User = Depends(deps.get_current_active_superuser)):
+    """In-process cache and pool statistics (superusers only)."""
+    stats = {
+        "auth_token_cache": deps.token_cache.stats(),
+        "auth_user_cache": deps.user_cache.stats(),
+        "password_hash_pool": security.password_pool.stats(),
+        "db_pool": pool_metrics.stats(),
+        "workout_cache": workout_cache.stats(),
+        "batch_generation_pool": generation_pool.stats()
+    }
+    if is_sqlite and settings.SQLITE_PERFORMANCE_MODE:
+        from app.db.sqlite import write_serializer
+        stats["sqlite_writer"] = write_serializer.stats()
+    return stats
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,6 +1,6 @@
 from .user import User
 from .training import TrainingSession
-from .nutrition import NutritionLog
+from .nutrition import NutritionLog, NutritionDailyRollup
 from .daily_log import DailyLog
 from .athlete_state import AthleteState
 from .feedback import WorkoutFeedback
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -6,6 +6,7 @@ from datetime import datetime
 class ChatMessage(Base):
     """Store AI Coach chat messages for history and fine-tuning"""
     __tablename__ = "chat_messages"
+    __table_args__ = (Index("ix_chat_messages_user_timestamp", "user_id", "timestamp"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,10 +1,13 @@
 from datetime import date
 from typing import Any
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class DailyLog(Base):
+    # One log per user per day; also serves the (user_id, date) lookups
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_daily_log_user_date"),)
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     date = Column(Date, default=date.today, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -17,6 +17,9 @@ class TaskCategory(str, enum.Enum):
 
 class DailyTask(Base):
     __tablename__ = "daily_tasks"
+    # One task per title per day; due_date is stored as midnight of the due day.
+    # The constraint's (user_id, due_date) prefix also serves the per-day task lookups.
+    __table_args__ = (UniqueConstraint("user_id", "due_date", "title", name="uq_daily_task_user_due_title"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Float, Index, Text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -29,6 +29,7 @@ class InjuryStatus(str, enum.Enum):
 
 class Injury(Base):
     __tablename__ = "injuries"
+    __table_args__ = (Index("ix_injuries_user_status", "user_id", "status"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
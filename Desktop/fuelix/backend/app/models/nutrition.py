@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from enum import Enum
@@ -11,6 +11,8 @@ class MealType(str, Enum):
     SNACK = "Snack"
 
 class NutritionLog(Base):
+    __table_args__ = (Index("ix_nutritionlog_user_timestamp", "user_id", "timestamp"),)
+
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -33,3 +35,17 @@ class WaterLog(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", backref="water_logs")
+
+class NutritionDailyRollup(Base):
+    """Per-user daily nutrition totals, maintained incrementally as meals are logged."""
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_nutrition_rollup_user_date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    
+    total_calories = Column(Integer, default=0, nullable=False)
+    total_protein = Column(Float, default=0.0, nullable=False)
+    total_carbs = Column(Float, default=0.0, nullable=False)
+    total_fats = Column(Float, default=0.0, nullable=False)
+    meal_count = Column(Integer, default=0, nullable=False)
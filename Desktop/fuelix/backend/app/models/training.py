@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Any, Dict, List
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Enum as SQLEnum, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -14,6 +14,7 @@ class TrainingType(str, Enum):
 
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
+    __table_args__ = (Index("ix_training_sessions_user_started_at", "user_id", "started_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,12 +1,13 @@
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, date
 
 class WorkoutGenerationRequest(BaseModel):
     time_available_minutes: int = 60
     equipment_available: Optional[List[str]] = None
     workout_type: str = "General"  # Boxing, Strength, Cardio, Athletics
     difficulty: str = "Intermediate" # Beginner, Intermediate, Advanced
+    seed: Optional[int] = None  # Same seed + inputs -> same (cached) workout
 
 class ExerciseSchema(BaseModel):
     name: str
@@ -23,6 +24,34 @@ class WorkoutResponse(BaseModel):
     reasoning: str
     exercises: List[ExerciseSchema]
     
+class BatchWorkoutItem(WorkoutGenerationRequest):
+    # With athlete_id, the athlete's stored fatigue (as of `day`) and active injuries are used
+    athlete_id: Optional[int] = None
+    day: Optional[date] = None  # With athlete_id and no seed: that athlete's workout of the day
+    state: Optional[Dict[str, float]] = None  # Fatigue per system; overrides the stored state
+    blocked_movements: List[str] = []  # Extra body parts and/or movement keywords to avoid
+
+class PlanAthlete(BatchWorkoutItem):
+    athlete_id: int
+
+class TeamPlanRequest(BaseModel):
+    athletes: List[Dict[str, Any]]  # PlanAthlete each, validated one by one
+    days: List[date]
+
+class WorkoutBatchRequest(BaseModel):
+    items: List[Dict[str, Any]] = []  # BatchWorkoutItem each, validated one by one
+    plan: Optional[TeamPlanRequest] = None  # Expanded athlete x day, after `items`
+
+class WorkoutBatchItemResult(BaseModel):
+    index: int
+    athlete_id: Optional[int] = None
+    day: Optional[date] = None
+    workout: Optional[WorkoutResponse] = None
+    error: Optional[str] = None
+
+class WorkoutBatchResponse(BaseModel):
+    results: List[WorkoutBatchItemResult]
+
 class FeedbackCreate(BaseModel):
     training_session_id: int
     rpe: int
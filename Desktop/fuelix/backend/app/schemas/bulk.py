@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel
+
+class BulkItemCreated(BaseModel):
+    index: int  # Position in the request array
+    id: int
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+class BulkIngestResult(BaseModel):
+    created: List[BulkItemCreated] = []
+    errors: List[BulkItemError] = []
@@ -1,9 +1,9 @@
-from datetime import date
+import datetime
 from typing import Optional
 from pydantic import BaseModel
 
 class DailyLogBase(BaseModel):
-    date: Optional[date] = None
+    date: Optional[datetime.date] = None
     total_calories_in: int = 0
     total_training_minutes: int = 0
     recovery_score: int = 0
@@ -13,7 +13,7 @@ class DailyLogBase(BaseModel):
     notes: Optional[str] = None
 
 class DailyLogCreate(DailyLogBase):
-    date: date
+    date: datetime.date
 
 class DailyLogUpdate(DailyLogBase):
     pass
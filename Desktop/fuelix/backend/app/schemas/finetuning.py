@@ -9,8 +9,9 @@ class ConversationRating(BaseModel):
 
 class DatasetExportRequest(BaseModel):
     min_rating: int = 4
-    format: str = "jsonl"  # jsonl, json, csv
+    format: str = "jsonl"  # jsonl, json
     dataset_version: Optional[str] = None
+    compress: bool = False  # gzip the exported file
 
 class DatasetStatistics(BaseModel):
     total_conversations: int
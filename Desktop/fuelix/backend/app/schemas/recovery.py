@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from app.models.injury import BodyPart, InjuryType, InjuryStatus
+from app.models.training import TrainingType
 
 class InjuryBase(BaseModel):
     body_part: BodyPart
@@ -33,3 +34,30 @@ class RecoveryStatusResponse(BaseModel):
     status: str
     breakdown: List[str]
     active_injuries: List[str]
+
+class ScheduledSession(BaseModel):
+    type: TrainingType
+    started_at: datetime
+    duration_minutes: int
+    rpe: Optional[int] = None
+    load_data: Optional[Dict[str, Any]] = None
+    notes: Optional[str] = None
+
+class FatigueForecastRequest(BaseModel):
+    # Explicit timestamps; when omitted the horizon is sampled from now
+    at: Optional[List[datetime]] = None
+    horizon_hours: float = 72
+    step_hours: float = 1
+    scheduled: List[ScheduledSession] = []
+
+class FatiguePoint(BaseModel):
+    at: datetime
+    cns_fatigue: float
+    muscular_upper_fatigue: float
+    muscular_lower_fatigue: float
+    cardio_fatigue: float
+    readiness: int
+
+class FatigueForecastResponse(BaseModel):
+    as_of: Optional[datetime]
+    points: List[FatiguePoint]
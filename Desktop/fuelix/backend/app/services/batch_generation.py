@@ -0,0 +1,137 @@
+"""
+Batch workout generation across a process pool.
+
+Workers are forked from a forkserver that has already imported the workout generator,
+so the knowledge base and its exercise indexes are built once and shared copy-on-write
+instead of rebuilt per worker. Each worker precompiles the workout templates on start.
+Results come back in request order; a failing item yields an error, not a failed batch.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Module workers import before forking (shared knowledge base / indexes)
+PRELOAD_MODULES = ["app.ai_engine.workout_generator"]
+
+DIFFICULTIES = ("Beginner", "Intermediate", "Advanced")
+
+# (workout, None) on success, (None, error message) on failure
+ItemResult = Tuple[Optional[Dict[str, Any]], Optional[str]]
+
+
+def _warm_worker() -> None:
+    """Precompile the templates every worker would otherwise build on its first items."""
+    from app.ai_engine import workout_templates as templates
+    for difficulty in DIFFICULTIES:
+        templates.boxing_template(difficulty)
+        templates.cardio_template(difficulty)
+        templates.athletic_template(difficulty, True)
+        templates.athletic_template(difficulty, False)
+
+
+def generate_item(kwargs: Dict[str, Any]) -> ItemResult:
+    """Generate one session from WorkoutGenerator.generate_session keyword arguments."""
+    from app.ai_engine.workout_generator import WorkoutGenerator
+    try:
+        return WorkoutGenerator.generate_session(**kwargs), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _generate_chunk(items: List[Dict[str, Any]]) -> List[ItemResult]:
+    return [generate_item(kwargs) for kwargs in items]
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class GenerationPool:
+    """
+    Lazily started process pool for batch generation. Small batches run inline, where
+    pickling and IPC would cost more than they save; run benchmark_batch_generation.py
+    to find the break-even batch size on a given machine.
+    """
+
+    def __init__(self, max_workers: int = 0, min_parallel: int = 128, min_chunk: int = 32):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel = min_parallel
+        self.min_chunk = min_chunk
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.item_errors = 0
+        self.inline_batches = 0
+        self.pool_failures = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=_mp_context(),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def generate(self, items: List[Dict[str, Any]]) -> List[ItemResult]:
+        """Generate every item, results in the same order as `items`."""
+        parallel = self.max_workers > 1 and len(items) >= self.min_parallel
+        results = None
+        if parallel:
+            # A few chunks per worker keeps them evenly loaded; min_chunk keeps each
+            # task's work well above its IPC round trip
+            size = max(self.min_chunk, -(-len(items) // (self.max_workers * 4)))
+            chunks = [items[i:i + size] for i in range(0, len(items), size)]
+            try:
+                results = [r for chunk in self._get_executor().map(_generate_chunk, chunks) for r in chunk]
+            except Exception:
+                logger.exception("Batch generation pool failed, generating inline")
+                self.shutdown()
+        inline = results is None
+        if inline:
+            results = _generate_chunk(items)
+
+        with self._lock:
+            self.batches += 1
+            self.inline_batches += inline
+            self.pool_failures += parallel and inline
+            self.items += len(items)
+            self.item_errors += sum(1 for _, error in results if error is not None)
+        return results
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "batches": self.batches,
+            "inline_batches": self.inline_batches,
+            "items": self.items,
+            "item_errors": self.item_errors,
+            "pool_failures": self.pool_failures
+        }
+
+
+generation_pool = GenerationPool(
+    max_workers=settings.BATCH_GENERATION_WORKERS,
+    min_parallel=settings.BATCH_GENERATION_MIN_PARALLEL,
+    min_chunk=settings.BATCH_GENERATION_MIN_CHUNK
+)
@@ -0,0 +1,45 @@
+"""
+Shared pieces of the bulk ingestion endpoints: per-item validation and a single
+multi-row INSERT ... RETURNING for the rows that passed.
+"""
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.schemas.bulk import BulkItemCreated, BulkItemError
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+def validate_items(
+    items: Sequence[Any], schema: Type[SchemaType]
+) -> Tuple[List[Tuple[int, SchemaType]], List[BulkItemError]]:
+    """Validate each item on its own, so one bad entry doesn't reject the whole upload."""
+    if len(items) > settings.BULK_INGEST_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_INGEST_MAX_ITEMS} items per request"
+        )
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, errors=e.errors(include_url=False, include_context=False)))
+    return valid, errors
+
+
+def insert_rows(db: Session, model, indexed_rows: List[Tuple[int, Dict[str, Any]]]) -> List[BulkItemCreated]:
+    """
+    Insert all rows with one executemany INSERT ... RETURNING id, in the caller's
+    transaction. Returns the new ids mapped back to request positions.
+    """
+    if not indexed_rows:
+        return []
+    ids = db.scalars(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        [row for _, row in indexed_rows]
+    ).all()
+    return [BulkItemCreated(index=index, id=row_id) for (index, _), row_id in zip(indexed_rows, ids)]
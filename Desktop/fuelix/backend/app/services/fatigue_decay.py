@@ -0,0 +1,93 @@
+"""
+Periodic fatigue decay over every AthleteState, vectorized with NumPy.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+import numpy as np
+from sqlalchemy import String, and_, bindparam, select, type_coerce, update
+from sqlalchemy.orm import Session
+from app.ai_engine.context_manager import ContextManager
+from app.ai_engine.fatigue_model import FatigueModel
+from app.models.athlete_state import AthleteState
+
+FATIGUE_COLUMNS = [getattr(AthleteState, FatigueModel.STATE_COLUMNS[s]) for s in FatigueModel.SYSTEMS]
+
+# updated_at exactly as stored, for the compare-and-set guard: SQLite keeps server_default
+# and ORM-written timestamps in different text formats, so parsed values can't round-trip
+RAW_UPDATED_AT = type_coerce(AthleteState.__table__.c.updated_at, String)
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """SQLite hands back naive UTC datetimes, Postgres aware ones; compare everything as naive UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def run_decay_pass(
+    db: Session,
+    now: Optional[datetime] = None,
+    model: str = "linear",
+    batch_size: int = 5000
+) -> int:
+    """
+    Decay every athlete's fatigue from its last write (updated_at) up to `now`.
+    Rows are processed in batches: one SELECT, one vectorized decay, one bulk UPDATE each.
+    Each UPDATE only applies if the row still holds the updated_at and fatigue values that
+    were read, so a session ingested in between (app.services.fatigue_state) is never
+    overwritten; such rows are skipped and decayed on the next pass. Bulk UPDATEs skip the
+    ORM events that expire coach context, so each batch's users are invalidated directly.
+    Returns the number of athletes updated.
+    """
+    now = now or datetime.utcnow()
+    updated = 0
+    last_id = 0
+
+    while True:
+        rows = db.execute(
+            select(AthleteState.id, AthleteState.updated_at, *FATIGUE_COLUMNS, AthleteState.user_id, RAW_UPDATED_AT.label("raw_updated_at"))
+            .where(AthleteState.id > last_id)
+            .order_by(AthleteState.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        ids = [row[0] for row in rows]
+        hours = np.array([
+            max(0.0, (now - to_naive_utc(row[1])).total_seconds() / 3600.0) if row[1] else 0.0
+            for row in rows
+        ])
+        fatigue = np.array([row[2:2 + len(FATIGUE_COLUMNS)] for row in rows], dtype=float)
+        fatigue = np.nan_to_num(fatigue)  # NULL columns count as no fatigue
+
+        decayed = FatigueModel.calculate_decay_batch(fatigue, hours, model=model)
+
+        # Compare-and-set executemany: match on id plus the updated_at and fatigue that were read
+        column_names = [FatigueModel.STATE_COLUMNS[s] for s in FatigueModel.SYSTEMS]
+        table = AthleteState.__table__
+        guard = and_(
+            table.c.id == bindparam("b_id"),
+            RAW_UPDATED_AT.is_not_distinct_from(bindparam("b_updated_at", type_=String)),
+            *(table.c[name].is_not_distinct_from(bindparam(f"b_{name}")) for name in column_names)
+        )
+        stmt = update(table).where(guard).values(
+            updated_at=bindparam("new_updated_at"),
+            **{name: bindparam(f"new_{name}") for name in column_names}
+        )
+        result = db.execute(stmt, [
+            {
+                "b_id": row[0], "b_updated_at": row.raw_updated_at, "new_updated_at": now,
+                **{f"b_{name}": old for name, old in zip(column_names, row[2:])},
+                **{f"new_{name}": new for name, new in zip(column_names, values)}
+            }
+            for row, values in zip(rows, decayed.tolist())
+        ])
+        db.commit()
+        for user_id in {row.user_id for row in rows}:
+            ContextManager.invalidate(user_id)
+        # Not every driver reports per-row counts for executemany
+        updated += result.rowcount if db.get_bind().dialect.supports_sane_multi_rowcount else len(ids)
+
+    return updated
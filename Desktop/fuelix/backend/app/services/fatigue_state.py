@@ -0,0 +1,256 @@
+"""
+Event-sourced athlete fatigue.
+
+AthleteState holds each system's fatigue as of its last write. Logging a training session
+folds it into that state: decay from the last write up to the session's start, then add
+the session's FatigueModel impact. Replaying the session log with the same fold rebuilds
+the state from scratch, and reading fatigue "now" is one decay of the stored vector.
+Forecasts at arbitrary times reuse the same closed form, vectorized over the time points.
+"""
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.ai_engine.fatigue_model import FatigueModel
+from app.core.config import settings
+from app.models.athlete_state import AthleteState
+from app.models.training import TrainingSession, TrainingType
+from app.services.fatigue_decay import to_naive_utc
+
+STATE_COLUMN_NAMES = [FatigueModel.STATE_COLUMNS[s] for s in FatigueModel.SYSTEMS]
+
+BASELINE_RPE = 5  # FatigueModel's neutral intensity, used when a session has no RPE
+HARD_RPE = 7      # At or above this, boxing counts as heavy and cardio/athletics as sprint work
+
+LOWER_BODY_KEYWORDS = ("leg", "lower", "squat", "deadlift", "lunge", "hinge")
+UPPER_BODY_KEYWORDS = ("upper", "push", "pull", "bench", "press", "chest", "back", "arm", "shoulder")
+
+# (started_at as naive UTC, impact key, rpe, duration_minutes)
+SessionEvent = Tuple[datetime, Optional[str], int, int]
+
+
+def impact_key(
+    session_type: str,
+    rpe: Optional[int],
+    load_data: Optional[Mapping[str, Any]] = None,
+    notes: Optional[str] = None
+) -> Optional[str]:
+    """
+    FatigueModel.IMPACT_MATRIX key for a logged session. None means no specific profile,
+    which FatigueModel treats as DEFAULT_IMPACT.
+    """
+    session_type = getattr(session_type, "value", session_type)
+    hard = (rpe or BASELINE_RPE) >= HARD_RPE
+
+    if session_type == TrainingType.BOXING.value:
+        return "boxing_heavy" if hard else "boxing_tech"
+    if session_type == TrainingType.CARDIO.value:
+        return "cardio_sprint" if hard else "cardio_LISS"
+    if session_type == TrainingType.ATHLETICS.value:
+        return "cardio_sprint" if hard else None
+    if session_type == TrainingType.STRENGTH.value:
+        # Split comes from the logged focus (e.g. the generator's "Lower Body Strength") or notes
+        text = " ".join(str(v) for v in (
+            (load_data or {}).get("focus"), (load_data or {}).get("body_part"), notes
+        ) if v).lower()
+        if any(k in text for k in LOWER_BODY_KEYWORDS):
+            return "strength_legs"
+        if any(k in text for k in UPPER_BODY_KEYWORDS):
+            return "strength_upper"
+    return None
+
+
+def session_event(
+    type: str,
+    started_at: datetime,
+    duration_minutes: int,
+    rpe: Optional[int] = None,
+    load_data: Optional[Mapping[str, Any]] = None,
+    notes: Optional[str] = None,
+    **_: Any
+) -> SessionEvent:
+    """Build the fold input from TrainingSession fields (accepts a model_dump() / row mapping)."""
+    return (
+        to_naive_utc(started_at),
+        impact_key(type, rpe, load_data, notes),
+        rpe or BASELINE_RPE,
+        duration_minutes
+    )
+
+
+def fold(
+    fatigue: np.ndarray,
+    as_of: Optional[datetime],
+    events: Iterable[SessionEvent],
+    model: str = "linear"
+) -> Tuple[np.ndarray, Optional[datetime]]:
+    """
+    Apply sessions to a (4,) fatigue vector valid at `as_of`. Returns the new vector and
+    the time it is valid at (the latest session start seen).
+    Sessions older than `as_of` (late syncs) add their impact already decayed by the lag.
+    """
+    for started_at, key, rpe, duration in events:
+        impact = FatigueModel.impact_vector(key, rpe, duration)
+        if as_of is None or started_at >= as_of:
+            hours = (started_at - as_of).total_seconds() / 3600.0 if as_of else 0.0
+            fatigue = FatigueModel.calculate_decay_batch(fatigue[None, :], hours, model=model)[0]
+            as_of = started_at
+        else:
+            lag = (as_of - started_at).total_seconds() / 3600.0
+            impact = FatigueModel.calculate_decay_batch(impact[None, :], lag, model=model)[0]
+        fatigue = FatigueModel.apply_impact_batch(fatigue, impact)
+    return fatigue, as_of
+
+
+def state_vector(state: AthleteState) -> np.ndarray:
+    return np.nan_to_num(np.array([getattr(state, c) for c in STATE_COLUMN_NAMES], dtype=float))
+
+
+def state_as_of(state: AthleteState) -> Optional[datetime]:
+    """
+    When the stored fatigue was last brought up to date: the decay pass stamps updated_at,
+    ingestion stamps both updated_at and last_workout_date.
+    """
+    times = [to_naive_utc(t) for t in (state.updated_at, state.last_workout_date) if t is not None]
+    return max(times) if times else None
+
+
+def ingest_sessions(db: Session, user_id: int, events: List[SessionEvent], model: Optional[str] = None) -> AthleteState:
+    """
+    Fold newly logged sessions into the user's AthleteState (created if missing).
+    Runs in the caller's transaction; the caller commits.
+    """
+    model = model or settings.FATIGUE_DECAY_MODEL
+    state = db.query(AthleteState).filter(AthleteState.user_id == user_id).with_for_update().first()
+    if state is None:
+        state = AthleteState(user_id=user_id)
+        db.add(state)
+        fatigue, as_of = np.zeros(len(FatigueModel.SYSTEMS)), None
+    else:
+        fatigue, as_of = state_vector(state), state_as_of(state)
+
+    fatigue, as_of = fold(fatigue, as_of, sorted(events, key=lambda e: e[0]), model=model)
+
+    for column, value in zip(STATE_COLUMN_NAMES, fatigue.tolist()):
+        setattr(state, column, value)
+    if as_of is not None:
+        # Explicit value so the onupdate=now() default doesn't move the as-of time
+        state.updated_at = as_of
+        state.last_workout_date = as_of
+    return state
+
+
+def fatigue_at(state: AthleteState, when: Optional[datetime] = None, model: Optional[str] = None) -> Dict[str, float]:
+    """Fatigue per system at `when` (default now), keyed like FatigueModel state dicts."""
+    fatigue = state_vector(state)
+    as_of = state_as_of(state)
+    if as_of is not None:
+        hours = max(0.0, ((when or datetime.utcnow()) - as_of).total_seconds() / 3600.0)
+        fatigue = FatigueModel.calculate_decay_batch(
+            fatigue[None, :], hours, model=model or settings.FATIGUE_DECAY_MODEL
+        )[0]
+    return {f"{system}_fatigue": value for system, value in zip(FatigueModel.SYSTEMS, fatigue.tolist())}
+
+
+def readiness(state: AthleteState, when: Optional[datetime] = None) -> int:
+    """O(1) readiness from the stored state: one decay of four numbers, no session history."""
+    return FatigueModel.get_readiness_score(fatigue_at(state, when))
+
+
+def fatigue_curve(
+    state: Optional[AthleteState],
+    times: Sequence[datetime],
+    scheduled: Iterable[SessionEvent] = (),
+    model: Optional[str] = None
+) -> np.ndarray:
+    """
+    Fatigue (len(times), 4) in SYSTEMS order at each of `times`, from the stored state plus
+    sessions scheduled after it.
+
+    Decay between sessions is closed-form, so only the K scheduled sessions are folded
+    (giving the state right after each one); every time point is then a single vectorized
+    decay from the latest session at or before it. Times before the stored state clamp to it.
+    """
+    model = model or settings.FATIGUE_DECAY_MODEL
+    scheduled = sorted(scheduled, key=lambda e: e[0])
+    if state is not None:
+        fatigue, as_of = state_vector(state), state_as_of(state)
+    else:
+        fatigue, as_of = np.zeros(len(FatigueModel.SYSTEMS)), None
+    if as_of is None:
+        # No history: zero fatigue from whichever comes first, now or the first session
+        as_of = min([datetime.utcnow()] + [e[0] for e in scheduled[:1]])
+    origin = as_of
+
+    anchor_hours, anchor_states = [0.0], [fatigue]
+    for event in scheduled:
+        fatigue, as_of = fold(fatigue, as_of, [event], model=model)
+        anchor_hours.append((as_of - origin).total_seconds() / 3600.0)
+        anchor_states.append(fatigue)
+
+    anchor_hours = np.array(anchor_hours)
+    hours = np.array([(to_naive_utc(t) - origin).total_seconds() / 3600.0 for t in times], dtype=float)
+    idx = np.maximum(np.searchsorted(anchor_hours, hours, side="right") - 1, 0)
+    since = np.maximum(0.0, hours - anchor_hours[idx])
+    return FatigueModel.calculate_decay_batch(np.array(anchor_states)[idx], since, model=model)
+
+
+def readiness_curve(curve: np.ndarray) -> np.ndarray:
+    """Vectorized FatigueModel.get_readiness_score over fatigue_curve() rows."""
+    return np.maximum(0, 100 - curve.mean(axis=1)).astype(int)
+
+
+def replay_fatigue(db: Session, user_id: Optional[int] = None, model: Optional[str] = None) -> int:
+    """
+    Rebuild AthleteState fatigue from the training log: one scan ordered by
+    (user_id, started_at), folded per user. Athletes without sessions are reset to zero.
+    Returns the number of athletes written.
+    """
+    model = model or settings.FATIGUE_DECAY_MODEL
+    stmt = (
+        select(
+            TrainingSession.user_id, TrainingSession.type, TrainingSession.started_at,
+            TrainingSession.duration_minutes, TrainingSession.rpe,
+            TrainingSession.load_data, TrainingSession.notes
+        )
+        .where(TrainingSession.started_at.is_not(None))
+        .order_by(TrainingSession.user_id, TrainingSession.started_at, TrainingSession.id)
+        .execution_options(yield_per=1000)
+    )
+    if user_id is not None:
+        stmt = stmt.where(TrainingSession.user_id == user_id)
+
+    rebuilt: Dict[int, Tuple[np.ndarray, Optional[datetime]]] = {}
+    for uid, rows in groupby(db.execute(stmt), key=lambda row: row.user_id):
+        rebuilt[uid] = fold(
+            np.zeros(len(FatigueModel.SYSTEMS)), None,
+            (session_event(**row._mapping) for row in rows), model=model
+        )
+
+    existing_stmt = select(AthleteState.user_id, AthleteState.id)
+    if user_id is not None:
+        existing_stmt = existing_stmt.where(AthleteState.user_id == user_id)
+    existing = dict(db.execute(existing_stmt).all())
+
+    zero = (np.zeros(len(FatigueModel.SYSTEMS)), None)
+    updates = []
+    for uid, state_id in existing.items():
+        fatigue, as_of = rebuilt.get(uid, zero)
+        row = {"id": state_id, "last_workout_date": as_of, **dict(zip(STATE_COLUMN_NAMES, fatigue.tolist()))}
+        if as_of is not None:
+            row["updated_at"] = as_of
+        updates.append(row)
+    if updates:
+        # ORM bulk UPDATE by primary key (executemany)
+        db.execute(update(AthleteState), updates)
+
+    for uid in rebuilt.keys() - existing.keys():
+        fatigue, as_of = rebuilt[uid]
+        db.add(AthleteState(
+            user_id=uid, last_workout_date=as_of, updated_at=as_of,
+            **dict(zip(STATE_COLUMN_NAMES, fatigue.tolist()))
+        ))
+    db.commit()
+    return len(existing) + len(rebuilt.keys() - existing.keys())
@@ -0,0 +1,98 @@
+"""
+Maintenance of NutritionDailyRollup, the per-day nutrition totals read by the calendar view.
+"""
+from datetime import date
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.upsert import dialect_insert
+from app.models.nutrition import NutritionLog, NutritionDailyRollup
+
+TOTAL_COLUMNS = ("total_calories", "total_protein", "total_carbs", "total_fats", "meal_count")
+
+
+def add_to_rollup(
+    db: Session,
+    user_id: int,
+    day: date,
+    calories: int,
+    protein_g: float = 0.0,
+    carbs_g: float = 0.0,
+    fats_g: float = 0.0,
+    meal_count: int = 1
+) -> None:
+    """
+    Add meal totals to the user's rollup row for `day`, creating it if needed.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    values = {
+        "user_id": user_id,
+        "date": day,
+        "total_calories": calories,
+        "total_protein": protein_g or 0.0,
+        "total_carbs": carbs_g or 0.0,
+        "total_fats": fats_g or 0.0,
+        "meal_count": meal_count,
+    }
+    insert = dialect_insert(db)
+    if insert is not None:
+        # Single-statement upsert; concurrent first meals of the day can't collide
+        stmt = insert(NutritionDailyRollup).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={col: getattr(NutritionDailyRollup, col) + getattr(stmt.excluded, col) for col in TOTAL_COLUMNS}
+        )
+        db.execute(stmt)
+        return
+
+    updated = db.query(NutritionDailyRollup).filter(
+        NutritionDailyRollup.user_id == user_id,
+        NutritionDailyRollup.date == day
+    ).update(
+        {getattr(NutritionDailyRollup, col): getattr(NutritionDailyRollup, col) + values[col] for col in TOTAL_COLUMNS},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(NutritionDailyRollup(**values))
+
+
+def backfill_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Rebuild rollup rows from NutritionLog with one GROUP BY per run.
+    Existing rollups in scope are replaced. Returns the number of rows written.
+    """
+    day = func.date(NutritionLog.timestamp)
+    query = db.query(
+        NutritionLog.user_id,
+        day.label("day"),
+        func.sum(NutritionLog.calories),
+        func.sum(NutritionLog.protein_g),
+        func.sum(NutritionLog.carbs_g),
+        func.sum(NutritionLog.fats_g),
+        func.count(NutritionLog.id)
+    ).group_by(NutritionLog.user_id, day)
+
+    existing = db.query(NutritionDailyRollup)
+    if user_id is not None:
+        query = query.filter(NutritionLog.user_id == user_id)
+        existing = existing.filter(NutritionDailyRollup.user_id == user_id)
+
+    rows = [
+        {
+            "user_id": uid,
+            "date": d if isinstance(d, date) else date.fromisoformat(d),
+            "total_calories": calories or 0,
+            "total_protein": protein or 0.0,
+            "total_carbs": carbs or 0.0,
+            "total_fats": fats or 0.0,
+            "meal_count": count,
+        }
+        for uid, d, calories, protein, carbs, fats, count in query.all()
+    ]
+
+    existing.delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(NutritionDailyRollup, rows)
+    db.commit()
+    return len(rows)
+
@@ -0,0 +1,28 @@
+"""
+Create the nutrition daily rollup table and rebuild it from existing meal logs.
+Run once after upgrading, or any time the rollups need to be recomputed.
+
+Usage: python backfill_nutrition_rollups.py [user_id]
+"""
+import sys
+from app.db.base import Base
+from app.db.session import engine, SessionLocal
+from app.models.user import User
+from app.models.nutrition import NutritionDailyRollup
+from app.services.nutrition_rollup import backfill_rollups
+
+def backfill(user_id=None):
+    print("Creating nutritiondailyrollup table...")
+    Base.metadata.create_all(bind=engine, tables=[NutritionDailyRollup.__table__])
+    
+    db = SessionLocal()
+    try:
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Backfilling nutrition rollups for {scope}...")
+        count = backfill_rollups(db, user_id=user_id)
+        print(f"✅ Wrote {count} daily rollup rows")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,95 @@
+"""
+Benchmark batch workout generation: inline vs the process pool at increasing worker counts,
+then the break-even batch size (smallest batch the pool generates faster than inline).
+    python benchmark_batch_generation.py [athletes] [days]
+Use the break-even size for BATCH_GENERATION_MIN_PARALLEL. Speedup is bounded by the
+number of cores; on one CPU the pool can only lose.
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+from app.ai_engine.workout_generator import daily_seed, session_cache
+from app.core.config import settings
+from app.services.batch_generation import GenerationPool
+
+BREAK_EVEN_SIZES = [8, 16, 32, 64, 128, 256, 512, 1024, 2000]
+
+WORKOUT_TYPES = ["Strength", "Boxing", "Cardio", "Athletics", "General"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced"]
+
+def build_items(athletes, days):
+    start = date.today()
+    items = []
+    for athlete_id in range(1, athletes + 1):
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            items.append({
+                "state": {"cns_fatigue": (athlete_id * 7 + offset * 13) % 80, "muscular_upper_fatigue": 30.0, "muscular_lower_fatigue": 45.0},
+                "equipment": ["bodyweight", "dumbbells", "barbell"],
+                "time_available": 60,
+                "blocked_movements": ["knee"] if athlete_id % 5 == 0 else [],
+                "workout_type": WORKOUT_TYPES[(athlete_id + offset) % len(WORKOUT_TYPES)],
+                "difficulty": DIFFICULTIES[athlete_id % len(DIFFICULTIES)],
+                "seed": daily_seed(athlete_id, day)
+            })
+    return items
+
+def best_of(pool, items, repeats=3):
+    best = None
+    for round_no in range(1, repeats + 1):
+        # Fresh seeds each round so neither our session cache nor the workers' can serve it
+        session_cache.clear()
+        round_items = [{**item, "seed": item["seed"] + round_no} for item in items]
+        start = time.perf_counter()
+        pool.generate(round_items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def break_even(items, cores):
+    """Smallest batch size at which the pool (one worker per core) beats inline, or None."""
+    print(f"\nBreak-even, {cores} workers, min_chunk={settings.BATCH_GENERATION_MIN_CHUNK}")
+    inline_pool = GenerationPool(max_workers=1)
+    pool = GenerationPool(max_workers=cores, min_parallel=1, min_chunk=settings.BATCH_GENERATION_MIN_CHUNK)
+    pool.generate(items[:cores])
+    found = None
+    for size in BREAK_EVEN_SIZES:
+        # Repeat items past the end with shifted seeds, so no batch has duplicates to cache
+        batch = [
+            {**items[i % len(items)], "seed": items[i % len(items)]["seed"] + 7919 * (i // len(items))}
+            for i in range(size)
+        ]
+        inline = best_of(inline_pool, batch, repeats=5)
+        parallel = best_of(pool, batch, repeats=5)
+        print(f"{size:5d} items  inline {1000 * inline:8.2f}ms  pool {1000 * parallel:8.2f}ms  {inline / parallel:.2f}x")
+        if found is None and parallel < inline:
+            found = size
+    pool.shutdown()
+    print(f"break-even: {found if found else 'none (pool never faster)'}")
+    return found
+
+def main():
+    athletes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    items = build_items(athletes, days)
+    cores = os.cpu_count() or 1
+    print(f"Generating {len(items)} workouts ({athletes} athletes x {days} days), {cores} CPUs")
+
+    inline = best_of(GenerationPool(max_workers=1), items)
+    print(f"inline      {inline:.3f}s  {len(items) / inline:8.0f} workouts/s  1.00x")
+
+    workers = 2
+    while workers <= max(2, cores):
+        pool = GenerationPool(max_workers=workers, min_parallel=1)
+        pool.generate(items[:workers])  # start workers outside the timing
+        elapsed = best_of(pool, items)
+        print(f"{workers:2d} workers  {elapsed:.3f}s  {len(items) / elapsed:8.0f} workouts/s  {inline / elapsed:.2f}x")
+        pool.shutdown()
+        workers *= 2
+
+    if cores > 1:
+        break_even(items, cores)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Pre-generate daily task plans for all active users.
+Schedule nightly (e.g. cron: 30 23 * * * python generate_daily_tasks.py) so the
+first app open of the day only has to read tasks.
+
+Usage: python generate_daily_tasks.py [YYYY-MM-DD]   (defaults to tomorrow)
+"""
+import sys
+from datetime import date, timedelta
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.ai_engine.notification_agent import NotificationAgent
+
+def generate(day: date):
+    db = SessionLocal()
+    try:
+        print(f"Generating daily tasks for {day.isoformat()}...")
+        count = NotificationAgent().pregenerate_daily_tasks(db, day)
+        print(f"✅ Task plans ready for {count} active users")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    target = date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else date.today() + timedelta(days=1)
+    generate(target)
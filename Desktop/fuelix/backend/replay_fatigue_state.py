@@ -0,0 +1,26 @@
+"""
+Rebuild AthleteState fatigue from the training session log.
+Use after changing the impact/decay model or to repair drifted state:
+    python replay_fatigue_state.py            # every athlete
+    python replay_fatigue_state.py <user_id>  # one athlete
+"""
+import sys
+import time
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.fatigue_state import replay_fatigue
+
+def replay(user_id=None):
+    db = SessionLocal()
+    try:
+        target = f"user {user_id}" if user_id is not None else "all athletes"
+        print(f"Replaying training log into {settings.FATIGUE_DECAY_MODEL} fatigue state for {target}...")
+        start = time.time()
+        count = replay_fatigue(db, user_id=user_id)
+        print(f"✅ Rebuilt fatigue for {count} athletes in {time.time() - start:.2f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    replay(int(sys.argv[1]) if len(sys.argv) > 1 else None)
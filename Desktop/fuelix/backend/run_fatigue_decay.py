@@ -0,0 +1,22 @@
+"""
+Apply fatigue decay to every athlete in one vectorized pass.
+Schedule hourly or nightly (e.g. cron: 0 * * * * python run_fatigue_decay.py).
+"""
+import time
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.fatigue_decay import run_decay_pass
+
+def run_decay():
+    db = SessionLocal()
+    try:
+        print(f"Running {settings.FATIGUE_DECAY_MODEL} fatigue decay pass...")
+        start = time.time()
+        count = run_decay_pass(db, model=settings.FATIGUE_DECAY_MODEL)
+        print(f"✅ Decayed fatigue for {count} athletes in {time.time() - start:.2f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run_decay()
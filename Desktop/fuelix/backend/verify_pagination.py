@@ -0,0 +1,88 @@
+"""
+Cursor pagination check for the history listings.
+
+Fills an in-memory SQLite database with dated and NULL-timestamp meals for one
+user, then walks every page with `paginate` and asserts that each row comes back
+exactly once, newest first with the undated rows last, for several page sizes and
+legacy `skip` offsets. Also checks that `limit` below 1 gives an empty last page.
+Exits non-zero on any mismatch.
+
+    python verify_pagination.py
+"""
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.api.pagination import paginate
+from app.db.base import Base
+import app.models  # noqa: F401
+from app.models.nutrition import MealType, NutritionLog
+from app.models.user import User
+
+DATED = 23
+UNDATED = 7
+
+
+def seed(db) -> list:
+    """Insert the meals and return their ids in the expected listing order."""
+    db.add(User(id=1, email="pages@example.com", hashed_password="x", is_active=True))
+    start = datetime(2026, 1, 1)
+    for i in range(DATED + UNDATED):
+        # Two meals per timestamp, so the id tiebreak is exercised too
+        db.add(NutritionLog(
+            user_id=1, food_name=f"meal {i}", calories=100,
+            meal_type=MealType.SNACK, timestamp=start + timedelta(hours=i // 2)
+        ))
+    db.commit()
+    # Every 4th meal loses its timestamp (the column default fills it on insert),
+    # so undated ids are interleaved with dated ones
+    rows = db.query(NutritionLog).order_by(NutritionLog.id).all()
+    for row in rows[3::4][:UNDATED]:
+        row.timestamp = None
+    db.commit()
+    dated = sorted((r for r in rows if r.timestamp is not None), key=lambda r: (r.timestamp, r.id), reverse=True)
+    undated = sorted((r.id for r in rows if r.timestamp is None), reverse=True)
+    return [r.id for r in dated] + undated
+
+
+def walk(db, limit: int) -> list:
+    query = db.query(NutritionLog).filter(NutritionLog.user_id == 1)
+    seen, cursor = [], None
+    while True:
+        rows, cursor = paginate(query, NutritionLog.timestamp, NutritionLog.id, limit=limit, cursor=cursor)
+        seen += [r.id for r in rows]
+        if cursor is None:
+            return seen
+
+
+def main() -> int:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    expected = seed(db)
+    query = db.query(NutritionLog).filter(NutritionLog.user_id == 1)
+
+    failures = 0
+
+    def check(description, ok):
+        nonlocal failures
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} {description}")
+
+    for limit in (1, 2, 5, DATED, DATED + 1, DATED + UNDATED, 100):
+        check(f"cursor walk, limit={limit}", walk(db, limit) == expected)
+
+    for skip in (0, 5, DATED - 1, DATED, DATED + 3, DATED + UNDATED + 1):
+        rows, _ = paginate(query, NutritionLog.timestamp, NutritionLog.id, limit=4, skip=skip)
+        check(f"skip={skip}, limit=4", [r.id for r in rows] == expected[skip:skip + 4])
+
+    for limit in (0, -1):
+        check(f"limit={limit} is an empty last page",
+              paginate(query, NutritionLog.timestamp, NutritionLog.id, limit=limit) == ([], None))
+
+    print(f"\nundated rows: {sum(1 for r in query if r.timestamp is None)}, failures: {failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
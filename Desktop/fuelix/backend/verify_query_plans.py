@@ -0,0 +1,94 @@
+"""
+Query-plan regression check for the hot per-user queries.
+
+Builds the schema in an in-memory SQLite database and asserts, via
+EXPLAIN QUERY PLAN, that each query is served by its composite index
+rather than a table scan. Exits non-zero if any plan regresses.
+
+    python verify_query_plans.py
+"""
+import sys
+from datetime import date, datetime, timedelta
+from sqlalchemy import create_engine, select, text, tuple_
+from app.db.base import Base
+import app.models  # noqa: F401
+from app.models.chat_message import ChatMessage
+from app.models.daily_log import DailyLog
+from app.models.daily_task import DailyTask
+from app.models.injury import Injury
+from app.models.nutrition import NutritionLog, NutritionDailyRollup
+from app.models.training import TrainingSession
+
+since = datetime.utcnow() - timedelta(days=30)
+
+# (description, statement, index expected in the plan)
+CHECKS = [
+    ("today's DailyLog",
+     select(DailyLog).where(DailyLog.user_id == 1, DailyLog.date == date.today()),
+     "uq_daily_log_user_date"),
+    ("DailyLog date range",
+     select(DailyLog).where(DailyLog.user_id == 1, DailyLog.date >= since.date()),
+     "uq_daily_log_user_date"),
+    ("meals since",
+     select(NutritionLog).where(NutritionLog.user_id == 1, NutritionLog.timestamp >= since)
+     .order_by(NutritionLog.timestamp.desc()),
+     "ix_nutritionlog_user_timestamp"),
+    ("meals keyset page",
+     select(NutritionLog).where(NutritionLog.user_id == 1, NutritionLog.timestamp.is_not(None), tuple_(NutritionLog.timestamp, NutritionLog.id) < tuple_(since, 100))
+     .order_by(NutritionLog.timestamp.desc(), NutritionLog.id.desc()).limit(101),
+     "ix_nutritionlog_user_timestamp"),
+    ("meals keyset page, undated (NULL timestamp) tail",
+     select(NutritionLog).where(NutritionLog.user_id == 1, NutritionLog.timestamp.is_(None), NutritionLog.id < 100)
+     .order_by(NutritionLog.id.desc()).limit(101),
+     "ix_nutritionlog_user_timestamp"),
+    ("recent training",
+     select(TrainingSession).where(TrainingSession.user_id == 1)
+     .order_by(TrainingSession.started_at.desc()).limit(3),
+     "ix_training_sessions_user_started_at"),
+    ("chat history",
+     select(ChatMessage).where(ChatMessage.user_id == 1)
+     .order_by(ChatMessage.timestamp.desc()).limit(50),
+     "ix_chat_messages_user_timestamp"),
+    ("today's tasks",
+     select(DailyTask).where(DailyTask.user_id == 1, DailyTask.due_date >= since, DailyTask.due_date < datetime.utcnow()),
+     "uq_daily_task_user_due_title"),
+    ("active injuries",
+     select(Injury).where(Injury.user_id == 1, Injury.status == "active"),
+     "ix_injuries_user_status"),
+    ("monthly nutrition rollups",
+     select(NutritionDailyRollup).where(NutritionDailyRollup.user_id == 1, NutritionDailyRollup.date >= since.date()),
+     "uq_nutrition_rollup_user_date"),
+]
+
+
+def explain(conn, stmt) -> str:
+    compiled = stmt.compile(conn, compile_kwargs={"literal_binds": True})
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def main() -> int:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        for description, stmt, index_name in CHECKS:
+            plan = explain(conn, stmt)
+            # SQLite implements table-level unique constraints as sqlite_autoindex_<table>_N
+            table = stmt.get_final_froms()[0].name
+            uses_index = (index_name in plan or (
+                index_name.startswith("uq_") and f"USING INDEX sqlite_autoindex_{table}_" in plan
+            )) and "(user_id=?" in plan and "TEMP B-TREE" not in plan
+            if uses_index:
+                print(f"✓ {description}: {plan.splitlines()[0]}")
+            else:
+                failures += 1
+                print(f"✗ {description}: expected {index_name}\n    {plan}")
+
+    print(f"\n{len(CHECKS) - failures}/{len(CHECKS)} query plans use their index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())